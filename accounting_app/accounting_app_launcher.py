@@ -6,14 +6,21 @@ This file is the entry point for the PyInstaller executable
 
 import os
 import sys
-import subprocess
+import json
+import importlib.util
 import webbrowser
 import threading
 import time
 from pathlib import Path
 
+# Base path resolved by the first setup_environment() call
+_BASE_PATH = None
+
 def setup_environment():
     """Setup environment variables and paths for the executable"""
+    global _BASE_PATH
+    if _BASE_PATH is not None:
+        return _BASE_PATH
     
     # Get the base path (where the executable is located)
     if getattr(sys, 'frozen', False):
@@ -23,56 +30,90 @@ def setup_environment():
         # Running as script
         base_path = Path(__file__).parent
     
-    # Add necessary paths
-    config_path = base_path / "config"
-    data_path = base_path / "data"
-    exports_path = base_path / "exports"
+    # Create directories if they don't exist; a single directory listing
+    # tells us which ones are already there on warm starts
+    with os.scandir(base_path) as entries:
+        existing_dirs = {entry.name for entry in entries if entry.is_dir()}
     
-    # Create directories if they don't exist
-    for path in [config_path, data_path, exports_path]:
-        path.mkdir(exist_ok=True)
+    for name in ("config", "data", "exports"):
+        if name not in existing_dirs:
+            (base_path / name).mkdir(exist_ok=True)
     
     # Set up OCR paths for Windows
     if os.name == 'nt':  # Windows
-        setup_windows_ocr_paths()
+        setup_windows_ocr_paths(base_path)
     
+    _BASE_PATH = base_path
     return base_path
 
-def setup_windows_ocr_paths():
+def load_ocr_path_cache(cache_file):
+    """Load previously discovered OCR paths, or an empty dict"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_ocr_path_cache(cache_file, ocr_paths):
+    """Remember discovered OCR paths for the next launch"""
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(ocr_paths, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ Could not cache OCR paths: {e}")
+
+def prepend_to_path(directory):
+    """Put directory first on PATH, dropping duplicate PATH entries"""
+    entries = [directory] + os.environ.get('PATH', '').split(os.pathsep)
+    os.environ['PATH'] = os.pathsep.join(dict.fromkeys(entry for entry in entries if entry))
+
+def setup_windows_ocr_paths(base_path=None):
     """Setup OCR paths for Windows executable"""
     try:
-        # Common Tesseract installation paths
-        tesseract_paths = [
-            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-            # Relative path for portable installation
-            str(Path(__file__).parent / "tesseract" / "tesseract.exe")
-        ]
+        cache_file = Path(base_path or Path(__file__).parent) / "config" / "ocr_paths.json"
+        cached_paths = load_ocr_path_cache(cache_file)
+        found_paths = {}
         
-        for path in tesseract_paths:
-            if os.path.exists(path):
-                os.environ['TESSERACT_CMD'] = path
-                print(f"✅ Tesseract found: {path}")
-                break
+        # Reuse the cached location while it still exists, otherwise probe
+        tesseract_path = cached_paths.get('tesseract')
+        if not (tesseract_path and Path(tesseract_path).is_file()):
+            # Common Tesseract installation paths
+            tesseract_paths = [
+                r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+                r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+                # Relative path for portable installation
+                str(Path(__file__).parent / "tesseract" / "tesseract.exe")
+            ]
+            tesseract_path = next((path for path in tesseract_paths if Path(path).is_file()), None)
+        
+        if tesseract_path:
+            os.environ['TESSERACT_CMD'] = tesseract_path
+            found_paths['tesseract'] = tesseract_path
+            print(f"✅ Tesseract found: {tesseract_path}")
         else:
             print("⚠️ Tesseract not found. OCR functionality will be disabled.")
             print("   Please install Tesseract OCR for full functionality")
         
-        # Poppler paths
-        poppler_paths = [
-            r"C:\poppler\Library\bin",
-            r"C:\poppler\bin",
-            str(Path(__file__).parent / "poppler" / "bin")
-        ]
+        poppler_path = cached_paths.get('poppler')
+        if not (poppler_path and Path(poppler_path).is_dir()):
+            # Poppler paths
+            poppler_paths = [
+                r"C:\poppler\Library\bin",
+                r"C:\poppler\bin",
+                str(Path(__file__).parent / "poppler" / "bin")
+            ]
+            poppler_path = next((path for path in poppler_paths if Path(path).is_dir()), None)
         
-        for path in poppler_paths:
-            if os.path.exists(path):
-                os.environ['PATH'] = path + os.pathsep + os.environ['PATH']
-                print(f"✅ Poppler found: {path}")
-                break
+        if poppler_path:
+            prepend_to_path(poppler_path)
+            found_paths['poppler'] = poppler_path
+            print(f"✅ Poppler found: {poppler_path}")
         else:
             print("⚠️ Poppler not found. PDF to image conversion will be disabled.")
             print("   Please install Poppler for scanned PDF processing")
+        
+        if found_paths != cached_paths:
+            save_ocr_path_cache(cache_file, found_paths)
                 
     except Exception as e:
         print(f"⚠️ Error setting up OCR paths: {e}")
@@ -81,20 +122,10 @@ def check_dependencies():
     """Check if required dependencies are available"""
     missing_deps = []
     
-    try:
-        import streamlit
-    except ImportError:
-        missing_deps.append("streamlit")
-    
-    try:
-        import pandas
-    except ImportError:
-        missing_deps.append("pandas")
-    
-    try:
-        import pdfplumber
-    except ImportError:
-        missing_deps.append("pdfplumber")
+    # Only probe the import system; the modules themselves load when used
+    for name in ("streamlit", "pandas", "pdfplumber"):
+        if importlib.util.find_spec(name) is None:
+            missing_deps.append(name)
     
     if missing_deps:
         print(f"❌ Missing dependencies: {', '.join(missing_deps)}")
@@ -104,8 +135,27 @@ def check_dependencies():
     
     return True
 
+def prewarm_imports():
+    """Import the categorizer's heavy dependencies ahead of the first request"""
+    try:
+        import pandas
+        import numpy
+        import sklearn.linear_model
+        from sklearn.feature_extraction.text import HashingVectorizer
+        
+        # Triggers SciPy's lazy sparse-matrix initialisation
+        HashingVectorizer().transform(["warm up"])
+    except Exception as e:
+        print(f"⚠️ Prewarming imports failed: {e}")
+
 def open_browser():
     """Open browser after Streamlit starts"""
+    # Use the start-up wait to import heavy modules (opt-in via PREWARM=1)
+    if os.environ.get("PREWARM") == "1":
+        prewarm_thread = threading.Thread(target=prewarm_imports)
+        prewarm_thread.daemon = True
+        prewarm_thread.start()
+    
     time.sleep(3)  # Wait for Streamlit to start
     webbrowser.open("http://localhost:8501")
 
@@ -143,18 +193,21 @@ def main():
         browser_thread.daemon = True
         browser_thread.start()
         
-        # Start Streamlit app
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(main_app_path), 
-            "--server.port=8501",
-            "--server.address=0.0.0.0",
-            "--browser.gatherUsageStats=false",
-            "--theme.primaryColor=#366092",
-            "--theme.backgroundColor=#ffffff",
-            "--theme.secondaryBackgroundColor=#f0f2f6",
-            "--theme.textColor=#262730"
-        ])
+        # Start Streamlit app in this process instead of spawning a second
+        # interpreter that would import streamlit and pandas all over again
+        from streamlit.web import bootstrap
+        
+        flag_options = {
+            "server_port": 8501,
+            "server_address": "0.0.0.0",
+            "browser_gatherUsageStats": False,
+            "theme_primaryColor": "#366092",
+            "theme_backgroundColor": "#ffffff",
+            "theme_secondaryBackgroundColor": "#f0f2f6",
+            "theme_textColor": "#262730"
+        }
+        bootstrap.load_config_options(flag_options=flag_options)
+        bootstrap.run(str(main_app_path), False, [], flag_options)
         
     except KeyboardInterrupt:
         print("\n🛑 Application stopped by user")
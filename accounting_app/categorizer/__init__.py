@@ -8,9 +8,21 @@ This module handles transaction categorization including:
 - Confidence scoring and validation
 """
 
-from .rule_engine import RuleEngine
-from .ai_classifier import AIClassifier
-from .category_manager import CategoryManager
+# Submodules are imported on first attribute access (PEP 562) so that
+# importing the package does not pull in pandas / scikit-learn up front
+_LAZY_IMPORTS = {
+    'RuleEngine': '.rule_engine',
+    'AIClassifier': '.ai_classifier',
+    'CategoryManager': '.category_manager'
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'RuleEngine',
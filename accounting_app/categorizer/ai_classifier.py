@@ -1,31 +1,21 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
+import importlib.util
 import json
 from pathlib import Path
-import joblib
 import warnings
 warnings.filterwarnings('ignore')
 
-# Try to import sklearn components with proper error handling
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.model_selection import train_test_split
-    from sklearn.metrics import classification_report, accuracy_score
-    SKLEARN_AVAILABLE = True
-except ImportError as e:
-    print(f"Scikit-learn not available: {e}")
+if TYPE_CHECKING:
+    import pandas as pd
+    import numpy as np
+
+# pandas, numpy, joblib and scikit-learn are imported inside the methods that
+# use them so importing the categorizer stays cheap when AI is never used
+SKLEARN_AVAILABLE = importlib.util.find_spec('sklearn') is not None
+if not SKLEARN_AVAILABLE:
+    print("Scikit-learn not available")
     print("AI features will be disabled. Please install scikit-learn:")
     print("pip install scikit-learn")
-    SKLEARN_AVAILABLE = False
-    # Define fallback classes to avoid import errors
-    class TfidfVectorizer:
-        def __init__(self, *args, **kwargs):
-            raise ImportError("Scikit-learn not installed")
-    class RandomForestClassifier:
-        def __init__(self, *args, **kwargs):
-            raise ImportError("Scikit-learn not installed")
 
 class AIClassifier:
     """
@@ -39,20 +29,22 @@ class AIClassifier:
             self.vectorizer = None
             self.label_encoder = {}
             self.reverse_label_encoder = {}
+            self._classes = None
             self.is_trained = False
             print("⚠️ AI Classifier disabled: scikit-learn not installed")
             return
         
         self.model = None
-        self.vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
+        self.vectorizer = None
         self.label_encoder = {}
         self.reverse_label_encoder = {}
+        self._classes = None
         self.is_trained = False
         
         if model_path and Path(model_path).exists():
             self.load_model(model_path)
     
-    def train(self, training_data: pd.DataFrame, text_column: str = 'description', 
+    def train(self, training_data: 'pd.DataFrame', text_column: str = 'description', 
               label_column: str = 'category', test_size: float = 0.2) -> Dict[str, Any]:
         """
         Train the AI classifier on labeled transaction data
@@ -60,6 +52,12 @@ class AIClassifier:
         if not SKLEARN_AVAILABLE:
             return {'error': 'Scikit-learn not installed. Please install scikit-learn to use AI features.'}
         
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import Pipeline
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import classification_report, accuracy_score
+        
         try:
             # Prepare data
             X = training_data[text_column].fillna('').astype(str)
@@ -74,14 +72,20 @@ class AIClassifier:
                 X, y_encoded, test_size=test_size, random_state=42, stratify=y_encoded
             )
             
-            # Vectorize text
+            # Vectorize text; hashing avoids storing a fitted vocabulary
+            self.vectorizer = Pipeline([
+                ('hashing', HashingVectorizer(n_features=2 ** 16, ngram_range=(1, 2),
+                                              alternate_sign=False)),
+                ('tfidf', TfidfTransformer())
+            ])
             X_train_vec = self.vectorizer.fit_transform(X_train)
             X_test_vec = self.vectorizer.transform(X_test)
             
-            # Train model
-            self.model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=20,
+            # Train model; a linear model predicts with one sparse matmul
+            self.model = SGDClassifier(
+                loss='log_loss',
+                alpha=1e-5,
+                n_jobs=-1,
                 random_state=42,
                 class_weight='balanced'
             )
@@ -101,7 +105,7 @@ class AIClassifier:
             
             results = {
                 'accuracy': accuracy,
-                'model_type': 'RandomForest',
+                'model_type': 'SGDClassifier',
                 'training_samples': len(X_train),
                 'test_samples': len(X_test),
                 'classes_trained': len(self.label_encoder),
@@ -122,6 +126,8 @@ class AIClassifier:
             # Fallback to rule-based if model not trained or sklearn not available
             return ['miscellaneous'] * len(descriptions)
         
+        import numpy as np
+        
         try:
             # Vectorize descriptions
             X_vec = self.vectorizer.transform(descriptions)
@@ -143,24 +149,43 @@ class AIClassifier:
     
     def predict_single(self, description: str, return_confidence: bool = False) -> str:
         """Predict category for a single transaction description"""
-        predictions = self.predict([description], return_confidence)
-        if return_confidence:
-            return predictions[0][0], predictions[1][0]
-        return predictions[0]
+        if not SKLEARN_AVAILABLE or not self.is_trained or self.model is None:
+            return ('miscellaneous', 0.0) if return_confidence else 'miscellaneous'
+        
+        try:
+            X_vec = self.vectorizer.transform((description,))
+            
+            if return_confidence:
+                # The most probable class is also the predicted one, so a
+                # single predict_proba call answers both questions
+                probabilities = self.model.predict_proba(X_vec)[0]
+                best = probabilities.argmax()
+                return self._classes[self.model.classes_[best]], float(probabilities[best])
+            
+            return self._classes[self.model.predict(X_vec)[0]]
+            
+        except Exception as e:
+            print(f"Error in AI prediction: {e}")
+            return ('miscellaneous', 0.0) if return_confidence else 'miscellaneous'
     
-    def _fit_label_encoder(self, labels: pd.Series):
+    def _fit_label_encoder(self, labels: 'pd.Series'):
         """Fit label encoder to category labels"""
+        import numpy as np
+        
         unique_labels = labels.unique()
+        self._classes = np.asarray(unique_labels, dtype=object)
         self.label_encoder = {label: idx for idx, label in enumerate(unique_labels)}
         self.reverse_label_encoder = {idx: label for label, idx in self.label_encoder.items()}
     
-    def _encode_labels(self, labels: pd.Series) -> np.ndarray:
+    def _encode_labels(self, labels: 'pd.Series') -> 'np.ndarray':
         """Encode string labels to integers"""
-        return labels.map(self.label_encoder).values
+        import pandas as pd
+        
+        return pd.Categorical(labels, categories=self._classes).codes
     
-    def _decode_labels(self, encoded_labels: np.ndarray) -> List[str]:
+    def _decode_labels(self, encoded_labels: 'np.ndarray') -> List[str]:
         """Decode integer labels back to strings"""
-        return [self.reverse_label_encoder.get(label, 'miscellaneous') for label in encoded_labels]
+        return self._classes[encoded_labels].tolist()
     
     def save_model(self, model_path: str):
         """Save trained model to file"""
@@ -168,6 +193,8 @@ class AIClassifier:
             print("Cannot save model: scikit-learn not installed")
             return
         
+        import joblib
+        
         try:
             model_data = {
                 'model': self.model,
@@ -176,7 +203,8 @@ class AIClassifier:
                 'reverse_label_encoder': self.reverse_label_encoder,
                 'is_trained': self.is_trained
             }
-            joblib.dump(model_data, model_path)
+            # The hashed coefficient matrix is mostly zeros and compresses well
+            joblib.dump(model_data, model_path, compress=3)
             print(f"Model saved to {model_path}")
         except Exception as e:
             print(f"Error saving model: {e}")
@@ -187,29 +215,43 @@ class AIClassifier:
             print("Cannot load model: scikit-learn not installed")
             return
         
+        import joblib
+        import numpy as np
+        
         try:
             model_data = joblib.load(model_path)
             self.model = model_data['model']
             self.vectorizer = model_data['vectorizer']
             self.label_encoder = model_data['label_encoder']
             self.reverse_label_encoder = model_data['reverse_label_encoder']
+            self._classes = np.asarray(
+                [self.reverse_label_encoder[idx] for idx in range(len(self.reverse_label_encoder))],
+                dtype=object
+            )
             self.is_trained = model_data['is_trained']
             print(f"Model loaded from {model_path}")
         except Exception as e:
             print(f"Error loading model: {e}")
     
-    def get_feature_importance(self, top_n: int = 20) -> pd.DataFrame:
-        """Get feature importance from trained model"""
+    def get_feature_importance(self, top_n: int = 20) -> 'pd.DataFrame':
+        """
+        Get feature importance from trained model
+        
+        Importance is the largest absolute class weight of each feature.
+        Features are hashed, so they are identified by their column index.
+        """
+        import pandas as pd
+        import numpy as np
+        
         if not SKLEARN_AVAILABLE or not self.is_trained or self.model is None:
             return pd.DataFrame()
         
         try:
-            feature_names = self.vectorizer.get_feature_names_out()
-            importances = self.model.feature_importances_
+            importances = np.abs(self.model.coef_).max(axis=0)
             
             # Create DataFrame with feature importance
             importance_df = pd.DataFrame({
-                'feature': feature_names,
+                'feature': np.arange(len(importances)),
                 'importance': importances
             }).sort_values('importance', ascending=False).head(top_n)
             
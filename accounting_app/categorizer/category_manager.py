@@ -1,7 +1,13 @@
 import pandas as pd
-import re
+import numpy as np
+import csv
+import time
+from array import array
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
 from typing import Dict, List, Any, Optional
-from .rule_engine import RuleEngine
+from .rule_engine import RuleEngine, contains_word
 from .ai_classifier import AIClassifier
 
 class CategoryManager:
@@ -16,13 +22,51 @@ class CategoryManager:
         self.ai_classifier = AIClassifier(ai_model_path)
         self.use_ai = False
         
-        # Categorization history for learning
-        self.categorization_history = []
+        # AI predictions depend only on the description and the model, so
+        # memoize them for the model they were made with
+        self._predict_ai_cached = lru_cache(maxsize=50_000)(self._predict_ai)
+        self._ai_cache_model = None
+        
+        # Categorization history for learning, stored column-wise so each
+        # categorization costs a few appends instead of a new dict
+        self._hist_desc: List[str] = []
+        self._hist_amount: List[float] = []
+        self._hist_type: List[str] = []
+        self._hist_cat: List[str] = []
+        self._hist_method: List[str] = []
+        self._hist_conf = array('d')
+        
+        # User corrections, kept as full records, with the history length at
+        # the time of each one so the export can keep them in order
+        self.feedback_history = []
+        self._feedback_offsets: List[int] = []
     
     def set_ai_mode(self, enabled: bool):
         """Enable or disable AI categorization"""
         self.use_ai = enabled
     
+    def _record_history(self, descriptions, amounts, types, categories, methods, confidences):
+        """Append categorization results to the columnar history"""
+        self._hist_desc.extend(descriptions)
+        self._hist_amount.extend(amounts)
+        self._hist_type.extend(types)
+        self._hist_cat.extend(categories)
+        self._hist_method.extend(methods)
+        self._hist_conf.extend(confidences)
+    
+    def _predict_ai(self, description_lower: str):
+        """Predict (category, confidence) for a lowercased description"""
+        return self.ai_classifier.predict_single(description_lower, return_confidence=True)
+    
+    def _cached_ai_prediction(self, description_lower: str):
+        """Memoized _predict_ai; the cache is dropped whenever the classifier's model changes"""
+        model = self.ai_classifier.model
+        if model is not self._ai_cache_model:
+            # Trained, loaded or swapped since the cached predictions were made
+            self._predict_ai_cached.cache_clear()
+            self._ai_cache_model = model
+        return self._predict_ai_cached(description_lower)
+    
     def categorize_transaction(self, description: str, amount: float, 
                              transaction_type: str) -> Dict[str, Any]:
         """
@@ -31,15 +75,19 @@ class CategoryManager:
         Returns:
             Dictionary with category and metadata
         """
+        # Lowercase once for the rules, the confidence check and the AI cache
+        description_lower = description.lower()
+        
         # Rule-based categorization
         rule_category = self.rule_engine.categorize_transaction(
-            description, amount, transaction_type, use_ai=False
+            description_lower, amount, transaction_type, use_ai=False, lowercased=True
         )
         
         result = {
             'category': rule_category,
             'method': 'rule_based',
-            'confidence': self.rule_engine._calculate_confidence(description, rule_category),
+            'confidence': self.rule_engine._calculate_confidence(description_lower, rule_category,
+                                                                 lowercased=True),
             'description': description,
             'amount': amount,
             'type': transaction_type
@@ -47,9 +95,7 @@ class CategoryManager:
         
         # AI categorization if enabled and trained
         if self.use_ai and self.ai_classifier.is_trained:
-            ai_category, ai_confidence = self.ai_classifier.predict_single(
-                description, return_confidence=True
-            )
+            ai_category, ai_confidence = self._cached_ai_prediction(description_lower)
             
             # Use AI category if confidence is high
             if ai_confidence > 0.7:  # Threshold for trusting AI
@@ -61,38 +107,62 @@ class CategoryManager:
                 })
         
         # Store in history
-        self.categorization_history.append(result.copy())
+        self._hist_desc.append(description)
+        self._hist_amount.append(amount)
+        self._hist_type.append(transaction_type)
+        self._hist_cat.append(result['category'])
+        self._hist_method.append(result['method'])
+        self._hist_conf.append(result['confidence'])
         
         return result
     
     def categorize_dataframe(self, transactions_df: pd.DataFrame) -> pd.DataFrame:
         """Categorize all transactions in a DataFrame"""
-        categorized_data = []
+        descriptions = transactions_df['description'].fillna('').astype(str)
+        descriptions_lower = descriptions.str.lower().to_numpy(dtype=object)
+        descriptions = descriptions.to_numpy(dtype=object)
+        amounts = transactions_df['amount'].to_numpy()
+        types = transactions_df['type'].to_numpy()
+        
+        # Rule-based categorization for the whole batch
+        categories, confidences = self.rule_engine.categorize_batch(
+            descriptions_lower, amounts, types, lowercased=True
+        )
+        methods = np.full(len(categories), 'rule_based', dtype=object)
         
-        for _, transaction in transactions_df.iterrows():
-            result = self.categorize_transaction(
-                transaction['description'],
-                transaction['amount'],
-                transaction['type']
+        # AI categorization if enabled and trained, as one batched prediction
+        # over the distinct descriptions
+        if self.use_ai and self.ai_classifier.is_trained and len(descriptions):
+            unique_descriptions, inverse = np.unique(descriptions_lower, return_inverse=True)
+            ai_categories, ai_confidences = self.ai_classifier.predict(
+                unique_descriptions.tolist(), return_confidence=True
             )
-            categorized_data.append(result)
+            ai_categories = np.asarray(ai_categories, dtype=object)[inverse]
+            ai_confidences = np.asarray(ai_confidences, dtype=float)[inverse]
+            
+            # Use AI category if confidence is high
+            use_ai = ai_confidences > 0.7  # Threshold for trusting AI
+            categories = np.where(use_ai, ai_categories, categories)
+            methods = np.where(use_ai, 'ai', methods)
+            confidences = np.where(use_ai, ai_confidences, confidences)
         
-        # Convert to DataFrame and merge with original
-        result_df = pd.DataFrame(categorized_data)
+        # Store in history
+        self._record_history(descriptions.tolist(), amounts.tolist(), types.tolist(),
+                             categories.tolist(), methods.tolist(), confidences)
         
         # Keep original columns and add categorization results
-        final_df = transactions_df.copy()
-        final_df['category'] = result_df['category']
-        final_df['categorization_method'] = result_df['method']
-        final_df['confidence_score'] = result_df['confidence']
-        
-        return final_df
+        return transactions_df.assign(
+            category=categories,
+            categorization_method=methods,
+            confidence_score=confidences
+        )
     
     def train_ai_model(self, training_data: pd.DataFrame, 
                       text_column: str = 'description',
                       label_column: str = 'category') -> Dict[str, Any]:
         """Train the AI model on labeled data"""
         results = self.ai_classifier.train(training_data, text_column, label_column)
+        self._predict_ai_cached.cache_clear()
         
         if 'error' not in results:
             self.use_ai = True  # Enable AI after successful training
@@ -111,42 +181,114 @@ class CategoryManager:
             method_counts = transactions_df['categorization_method'].value_counts().to_dict()
             stats['method_distribution'] = method_counts
         
-        # Category distribution by transaction type
-        credit_categories = transactions_df[transactions_df['type'] == 'CR']['category'].value_counts().to_dict()
-        debit_categories = transactions_df[transactions_df['type'] == 'DR']['category'].value_counts().to_dict()
+        # Category distribution by transaction type, in one pass over the frame
+        type_counts = transactions_df.groupby(['type', 'category'], sort=False).size()
+        type_counts = type_counts.sort_values(ascending=False, kind='stable')
         
-        stats['credit_categories'] = credit_categories
-        stats['debit_categories'] = debit_categories
+        for transaction_type, key in (('CR', 'credit_categories'), ('DR', 'debit_categories')):
+            if transaction_type in type_counts.index.get_level_values(0):
+                stats[key] = type_counts.loc[transaction_type].to_dict()
+            else:
+                stats[key] = {}
         
         return stats
     
+    # Columns of a categorization row, in the order they are recorded
+    _HISTORY_FIELDS = ('category', 'method', 'confidence', 'description', 'amount', 'type', 'ai_confidence')
+    
     def export_training_data(self, output_path: str):
-        """Export categorization history as training data"""
-        if not self.categorization_history:
+        """
+        Export categorization history as training data
+        
+        Rows are streamed in the order they were recorded, with the same
+        columns and value formatting as a DataFrame of the records would give.
+        """
+        if not self._hist_desc and not self.feedback_history:
             return
         
-        df = pd.DataFrame(self.categorization_history)
-        df.to_csv(output_path, index=False)
+        fieldnames = self._training_fieldnames()
+        slots = [fieldnames.index(key) for key in self._HISTORY_FIELDS if key in fieldnames]
+        format_amount = self._training_amount_formatter()
+        history = zip(self._hist_cat, self._hist_method, self._hist_conf,
+                      self._hist_desc, self._hist_amount, self._hist_type)
+        
+        def history_rows(count):
+            for category, method, confidence, description, amount, transaction_type in islice(history, count):
+                row = [''] * len(fieldnames)
+                values = (category, method, confidence, description, format_amount(amount), transaction_type,
+                          confidence if method == 'ai' else '')
+                for slot, value in zip(slots, values):
+                    row[slot] = value
+                yield row
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(fieldnames)
+            
+            # Categorization rows up to each feedback entry, then the entry itself
+            written = 0
+            for entry, offset in zip(self.feedback_history, self._feedback_offsets):
+                writer.writerows(history_rows(offset - written))
+                written = offset
+                writer.writerow([
+                    format_amount(entry.get(key, '')) if key == 'amount' else self._format_feedback_value(key, entry.get(key, ''))
+                    for key in fieldnames
+                ])
+            writer.writerows(history_rows(len(self._hist_desc) - written))
         print(f"Training data exported to {output_path}")
     
-    def get_suggested_categories(self, description: str, top_n: int = 3) -> List[Dict[str, Any]]:
-        """Get suggested categories for a description with confidence scores"""
-        suggestions = []
+    def _training_fieldnames(self) -> List[str]:
+        """Export columns in order of first appearance, as pandas orders record keys"""
+        # (history length, 0 for feedback / 1 for a categorization row, keys)
+        appearances = [(offset, 0, list(entry)) for entry, offset in zip(self.feedback_history, self._feedback_offsets)]
+        if self._hist_desc:
+            appearances.append((0, 1, list(self._HISTORY_FIELDS[:6])))
+        if 'ai' in self._hist_method:
+            appearances.append((self._hist_method.index('ai'), 1, ['ai_confidence']))
         
-        # Rule-based suggestions
-        desc_lower = description.lower()
-        for category_name, category_data in self.rule_engine.categories.items():
-            keywords = category_data.get('keywords', [])
-            for keyword in keywords:
-                if keyword in desc_lower:
-                    confidence = 0.9 if re.search(r'\b' + re.escape(keyword) + r'\b', desc_lower) else 0.7
-                    suggestions.append({
-                        'category': category_name,
-                        'confidence': confidence,
-                        'method': 'keyword',
-                        'matched_keyword': keyword
-                    })
-                    break  # One suggestion per category
+        fieldnames = []
+        for _, _, keys in sorted(appearances, key=lambda appearance: appearance[:2]):
+            fieldnames.extend(key for key in keys if key not in fieldnames)
+        return fieldnames
+    
+    def _training_amount_formatter(self):
+        """Write integer amounts as floats when the amounts mix ints and floats, as a float column would"""
+        amounts = chain(self._hist_amount, (entry.get('amount', '') for entry in self.feedback_history))
+        kinds = {self._amount_kind(amount) for amount in amounts}
+        kinds.discard(None)
+        if kinds == {int, float}:
+            return lambda amount: float(amount) if self._amount_kind(amount) is int else amount
+        return lambda amount: amount
+    
+    @staticmethod
+    def _amount_kind(amount: Any):
+        """int or float for numeric amounts, None for missing ones, str for anything else"""
+        if amount is None:
+            return None
+        if isinstance(amount, (float, np.floating)):
+            return float
+        if isinstance(amount, (int, np.integer)) and not isinstance(amount, bool):
+            return int
+        return str
+    
+    @staticmethod
+    def _format_feedback_value(key: str, value: Any) -> Any:
+        """Convert stored feedback values to their exported form"""
+        if key == 'timestamp':
+            # Stored as time.time_ns(); exported as local date and time
+            return datetime.fromtimestamp(value / 1e9)
+        return value
+    
+    def get_suggested_categories(self, description: str, top_n: int = 3,
+                                 description_lower: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get suggested categories for a description with confidence scores
+        
+        Callers that already hold the lowercased description can pass it as
+        description_lower to skip lowering it again
+        """
+        desc_lower = description_lower if description_lower is not None else description.lower()
+        suggestions = self._keyword_suggestions(desc_lower)
         
         # AI suggestions if available
         if self.use_ai and self.ai_classifier.is_trained:
@@ -165,6 +307,60 @@ class CategoryManager:
         suggestions.sort(key=lambda x: x['confidence'], reverse=True)
         return suggestions[:top_n]
     
+    def get_suggested_categories_batch(self, descriptions: List[str],
+                                       top_n: int = 3) -> List[List[Dict[str, Any]]]:
+        """
+        Get suggested categories for many descriptions at once
+        
+        Equivalent to calling get_suggested_categories per description, but
+        the AI model scores the whole batch in a single prediction
+        """
+        all_suggestions = [self._keyword_suggestions(description.lower()) for description in descriptions]
+        
+        # AI suggestions if available
+        if self.use_ai and self.ai_classifier.is_trained and descriptions:
+            try:
+                ai_predictions, ai_confidences = self.ai_classifier.predict(
+                    list(descriptions), return_confidence=True
+                )
+                for suggestions, ai_category, ai_confidence in zip(all_suggestions, ai_predictions, ai_confidences):
+                    suggestions.append({
+                        'category': ai_category,
+                        'confidence': ai_confidence,
+                        'method': 'ai',
+                        'matched_keyword': None
+                    })
+            except:
+                pass
+        
+        # Sort by confidence and return top N
+        for suggestions in all_suggestions:
+            suggestions.sort(key=lambda x: x['confidence'], reverse=True)
+        return [suggestions[:top_n] for suggestions in all_suggestions]
+    
+    def _keyword_suggestions(self, desc_lower: str) -> List[Dict[str, Any]]:
+        """Rule-based suggestions for a lowercased description"""
+        suggestions = []
+        
+        # The precompiled per-category alternation rejects categories
+        # without any keyword in a single scan
+        for category_name, keyword_pattern in self.rule_engine.keyword_patterns.items():
+            if not keyword_pattern.search(desc_lower):
+                continue
+            keywords = self.rule_engine.categories[category_name]['keywords']
+            for keyword in keywords:
+                if keyword in desc_lower:
+                    confidence = 0.9 if contains_word(desc_lower, keyword) else 0.7
+                    suggestions.append({
+                        'category': category_name,
+                        'confidence': confidence,
+                        'method': 'keyword',
+                        'matched_keyword': keyword
+                    })
+                    break  # One suggestion per category
+        
+        return suggestions
+    
     def add_feedback(self, transaction_data: Dict[str, Any], correct_category: str):
         """Add feedback to improve categorization"""
         feedback_entry = {
@@ -173,10 +369,11 @@ class CategoryManager:
             'type': transaction_data.get('type', 'DR'),
             'original_category': transaction_data.get('category', ''),
             'correct_category': correct_category,
-            'timestamp': pd.Timestamp.now()
+            'timestamp': time.time_ns()
         }
         
-        self.categorization_history.append(feedback_entry)
+        self.feedback_history.append(feedback_entry)
+        self._feedback_offsets.append(len(self._hist_desc))
         
         # TODO: Implement online learning to update models based on feedback
         print(f"Feedback received: {correct_category} for '{transaction_data.get('description', '')}'")
\ No newline at end of file
@@ -1,17 +1,77 @@
 import json
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+# Hyperscan is optional: when installed, all keywords are scanned in one pass
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# orjson parses UTF-8 bytes directly and is much faster; fall back to json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Amount-based heuristic tables shared by the single and batch code paths
+ATM_AMOUNTS = frozenset([500, 1000, 2000, 5000, 10000, 20000])
+FOOD_PATTERN = re.compile(r'cafe|restaurant|food|meal|snack')
+TRANSPORT_PATTERN = re.compile(r'fuel|petrol|bus|taxi|uber')
+
+# Numbered/named backreferences, conditionals and global inline flags in a user pattern
+UNJOINABLE_PATTERN = re.compile(r'\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)')
+
+def _is_word_char(char: str) -> bool:
+    """Word characters as defined by the regex word class for str patterns"""
+    return char.isalnum() or char == '_'
+
+def contains_word(text: str, keyword: str) -> bool:
+    """
+    Whole-word search with the same result as a word-boundary regex around keyword
+    
+    Checks the boundaries around each str.find hit directly, which is
+    cheaper than a regex when testing a single keyword.
+    """
+    if not keyword:
+        return re.search(r'\b', text) is not None
+    
+    starts_word = _is_word_char(keyword[0])
+    ends_word = _is_word_char(keyword[-1])
+    end_offset = len(keyword)
+    
+    index = text.find(keyword)
+    while index != -1:
+        before = index > 0 and _is_word_char(text[index - 1])
+        after = index + end_offset < len(text) and _is_word_char(text[index + end_offset])
+        # A word boundary holds where the word-ness of the neighbouring characters differs
+        if before != starts_word and after != ends_word:
+            return True
+        index = text.find(keyword, index + 1)
+    
+    return False
+
 class RuleEngine:
     def __init__(self, categories_file='config/categories.json'):
         self.categories = self._load_categories(categories_file)
-        self.vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=1000)
+        # Stateless vectorizer: no vocabulary to fit or keep in memory
+        self.vectorizer = HashingVectorizer(ngram_range=(1, 2), n_features=2**18,
+                                            alternate_sign=False, norm='l2')
+        
+        # Text-only matching repeats for recurring merchants, so memoize it
+        self._text_match_cached = lru_cache(maxsize=4096)(self._text_match)
+        
         self._build_keyword_matrix()
+        self._build_keyword_patterns()
         
         # Transaction type patterns
         self.type_patterns = {
@@ -27,8 +87,8 @@ class RuleEngine:
                 # Fallback to default categories
                 return self._get_default_categories()
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                categories = json.load(f)
+            with open(file_path, 'rb') as f:
+                categories = _json_loads(f.read())
             
             # Validate categories structure
             validated_categories = {}
@@ -97,7 +157,7 @@ class RuleEngine:
         }
     
     def _build_keyword_matrix(self):
-        """Build TF-IDF matrix for keyword matching"""
+        """Build hashed term matrix for keyword similarity matching"""
         try:
             # Create corpus from all keywords
             corpus = []
@@ -112,16 +172,135 @@ class RuleEngine:
                         self.category_list.append(category_name)
             
             if corpus:
-                self.keyword_matrix = self.vectorizer.fit_transform(corpus)
+                self.keyword_matrix = self.vectorizer.transform(corpus)
             else:
                 self.keyword_matrix = None
                 
         except Exception as e:
             print(f"Error building keyword matrix: {e}")
             self.keyword_matrix = None
+        
+        # Row-to-category lookup for fancy indexing in the batch path
+        self._category_arr = np.asarray(self.category_list, dtype=object)
+    
+    def _append_keywords(self, category_name: str, keywords: List[str]):
+        """Extend the keyword matrix with one category's keywords"""
+        if not keywords:
+            return
+        
+        try:
+            new_rows = self.vectorizer.transform(keywords)
+            if self.keyword_matrix is None:
+                self.keyword_matrix = new_rows
+                self.category_list = [category_name] * len(keywords)
+            else:
+                self.keyword_matrix = sparse.vstack([self.keyword_matrix, new_rows], format='csr')
+                self.category_list.extend([category_name] * len(keywords))
+            self._category_arr = np.asarray(self.category_list, dtype=object)
+            
+        except Exception as e:
+            print(f"Error extending keyword matrix: {e}")
+            self._build_keyword_matrix()
+    
+    def _build_keyword_patterns(self):
+        """Precompile keyword regexes used for substring and whole-word checks"""
+        # One keyword alternation per category for substring scans
+        self.keyword_patterns = {
+            category_name: re.compile('|'.join(map(re.escape, category_data['keywords'])))
+            for category_name, category_data in self.categories.items()
+            if category_data.get('keywords')
+        }
+        
+        # Every keyword of every category in one alternation, so descriptions
+        # without any keyword are rejected by a single scan
+        all_keywords = [keyword for category_data in self.categories.values()
+                        for keyword in category_data.get('keywords', [])]
+        self.any_keyword_pattern = re.compile('|'.join(map(re.escape, all_keywords))) if all_keywords else None
+        
+        # One whole-word keyword alternation per category
+        self.category_word_patterns = {
+            category_name: re.compile(r'\b(?:' + '|'.join(map(re.escape, category_data['keywords'])) + r')\b')
+            for category_name, category_data in self.categories.items()
+            if category_data.get('keywords')
+        }
+        
+        # Whole-word patterns in priority order (stable, so ties keep config order)
+        self._categories_by_priority = [
+            (category_name, self.category_word_patterns[category_name])
+            for category_name, category_data in sorted(self.categories.items(),
+                                                       key=lambda item: item[1].get('priority', 1))
+            if category_name in self.category_word_patterns
+        ]
+        
+        # Case-insensitive regexes per category; patterns that can be joined
+        # share one alternation, the rest keep their own compiled pattern
+        self.category_regex_patterns = {
+            category_name: self._compile_category_patterns(category_name, category_data['patterns'])
+            for category_name, category_data in self.categories.items()
+            if category_data.get('patterns')
+        }
+        
+        self._build_keyword_database()
+    
+    def _compile_category_patterns(self, category_name: str, patterns: List[str]) -> List[re.Pattern]:
+        """Compile a category's regex patterns, combining them where that keeps their meaning"""
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                print(f"Skipping invalid pattern {pattern!r} for category {category_name}: {e}")
+        
+        # Group references and global inline flags change meaning (or fail) inside an alternation
+        joinable = [regex for regex in compiled if not UNJOINABLE_PATTERN.search(regex.pattern)]
+        separate = [regex for regex in compiled if UNJOINABLE_PATTERN.search(regex.pattern)]
+        if len(joinable) > 1:
+            try:
+                joinable = [re.compile('|'.join(f'(?:{regex.pattern})' for regex in joinable), re.IGNORECASE)]
+            except re.error:
+                # e.g. the same group name in two patterns
+                pass
+        return joinable + separate
+    
+    def _build_keyword_database(self):
+        """Compile every whole-word keyword into one Hyperscan database
+        
+        Hyperscan word boundaries are ASCII-only, so the database is only
+        consulted for ASCII descriptions; anything else uses the regexes.
+        """
+        self.keyword_database = None
+        self.keyword_database_categories = []
+        self.keyword_database_top_ids = 0
+        if not HYPERSCAN_AVAILABLE:
+            return
+        
+        # Pattern ids follow category priority, so the lowest matched id wins
+        ranked = sorted(self.categories.items(), key=lambda item: item[1].get('priority', 1))
+        expressions = []
+        for category_name, category_data in ranked:
+            for keyword in category_data.get('keywords', []):
+                expressions.append((r'\b' + re.escape(keyword) + r'\b').encode('utf-8'))
+                self.keyword_database_categories.append(category_name)
+        
+        if not expressions:
+            return
+        
+        # Ids below this belong to the top-ranked category, which nothing can beat
+        self.keyword_database_top_ids = self.keyword_database_categories.count(self.keyword_database_categories[0])
+        
+        try:
+            database = hyperscan.Database()
+            database.compile(expressions=expressions,
+                             ids=list(range(len(expressions))),
+                             flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+                             elements=len(expressions))
+            self.keyword_database = database
+        except Exception as e:
+            print(f"Hyperscan keyword database unavailable, using regex matching: {e}")
+            self.keyword_database_categories = []
     
     def categorize_transaction(self, description: str, amount: float, transaction_type: str, 
-                             use_ai: bool = False) -> str:
+                             use_ai: bool = False, lowercased: bool = False) -> str:
         """
         Categorize transaction using rule-based approach with optional AI enhancement
         
@@ -130,12 +309,28 @@ class RuleEngine:
             amount: Transaction amount
             transaction_type: CR or DR
             use_ai: Whether to use AI-enhanced categorization
+            lowercased: Whether description is already lowercase
             
         Returns:
             Category name
         """
-        description_lower = description.lower()
+        description_lower = description if lowercased else description.lower()
+        
+        # Methods 1-3 depend only on the description text
+        text_match = self._text_match_cached(description_lower, use_ai)
+        if text_match:
+            return text_match
         
+        # Method 4: Amount-based heuristics
+        amount_match = self._amount_based_heuristics(description_lower, amount, transaction_type)
+        if amount_match:
+            return amount_match
+        
+        # Method 5: Default based on transaction type
+        return self._get_default_category(transaction_type)
+    
+    def _text_match(self, description_lower: str, use_ai: bool) -> Optional[str]:
+        """Apply the description-only rules (keywords, patterns, similarity)"""
         # Method 1: Exact keyword matching (highest priority)
         exact_match = self._exact_keyword_match(description_lower)
         if exact_match:
@@ -146,56 +341,172 @@ class RuleEngine:
         if pattern_match:
             return pattern_match
         
-        # Method 3: TF-IDF similarity matching
+        # Method 3: Term-vector similarity matching
         if use_ai and self.keyword_matrix is not None:
             similarity_match = self._similarity_match(description_lower)
             if similarity_match:
                 return similarity_match
         
+        return None
+    
+    def categorize_batch(self, descriptions, amounts, transaction_types,
+                         use_ai: bool = False, lowercased: bool = False):
+        """
+        Categorize many transactions at once
+        
+        Applies the same rules as categorize_transaction, but each rule is
+        evaluated as one vectorized string scan over the batch. Text rules run
+        once per distinct description, so repeated merchants cost nothing extra.
+        
+        Args:
+            descriptions: Array-like of transaction descriptions
+            amounts: Array-like of transaction amounts
+            transaction_types: Array-like of CR / DR markers
+            use_ai: Whether to use AI-enhanced categorization
+            lowercased: Whether descriptions are already lowercase strings
+            
+        Returns:
+            Tuple of (categories, confidence_scores) numpy arrays
+        """
+        descriptions = pd.Series(descriptions, dtype=object)
+        if not lowercased:
+            descriptions = descriptions.fillna('').astype(str).str.lower()
+        codes, unique_descriptions = pd.factorize(descriptions)
+        unique_descriptions = pd.Series(unique_descriptions, dtype=object)
+        amounts = np.asarray(amounts, dtype=float)
+        transaction_types = np.asarray(transaction_types, dtype=object)
+        
+        # Methods 1-3 depend only on the description text
+        text_categories = np.full(len(unique_descriptions), None, dtype=object)
+        pending = np.ones(len(unique_descriptions), dtype=bool)
+        
+        def assign(mask, category_name):
+            text_categories[mask] = category_name
+            pending[mask] = False
+        
+        # Method 1: Exact keyword matching
+        if self.keyword_database is not None:
+            # One multi-pattern scan per description instead of one pass per category
+            exact_matches = unique_descriptions.map(self._exact_keyword_match).to_numpy(dtype=object)
+            matched_rows = np.flatnonzero(pd.notna(exact_matches))
+            text_categories[matched_rows] = exact_matches[matched_rows]
+            pending[matched_rows] = False
+        else:
+            # Highest priority category first, restricted to descriptions
+            # containing at least one keyword
+            if self.any_keyword_pattern is not None:
+                has_keyword = unique_descriptions.str.contains(self.any_keyword_pattern).to_numpy(dtype=bool)
+            else:
+                has_keyword = np.zeros(len(unique_descriptions), dtype=bool)
+            candidates = has_keyword.copy()
+            
+            for category_name, word_pattern in self._categories_by_priority:
+                if not candidates.any():
+                    break
+                matched = unique_descriptions[candidates].str.contains(word_pattern).to_numpy(dtype=bool)
+                matched_rows = np.flatnonzero(candidates)[matched]
+                assign(matched_rows, category_name)
+                candidates[matched_rows] = False
+        
+        # Method 2: Pattern matching with regex
+        for category_name, regex_patterns in self.category_regex_patterns.items():
+            if not pending.any():
+                break
+            # Search directly: user patterns may contain groups, which str.contains warns about
+            pending_descriptions = unique_descriptions[pending]
+            matched = np.zeros(len(pending_descriptions), dtype=bool)
+            for regex_pattern in regex_patterns:
+                matched |= pending_descriptions.map(regex_pattern.search).notna().to_numpy(dtype=bool)
+            assign(np.flatnonzero(pending)[matched], category_name)
+        
+        # Method 3: Term-vector similarity matching
+        if use_ai and self.keyword_matrix is not None and pending.any():
+            pending_rows = np.flatnonzero(pending)
+            similarity_matches = self._similarity_match_batch(unique_descriptions.iloc[pending_rows])
+            matched = pd.notna(similarity_matches)
+            for category_name in pd.unique(similarity_matches[matched]):
+                assign(pending_rows[similarity_matches == category_name], category_name)
+        
+        categories = text_categories[codes]
+        pending = pending[codes]
+        
+        def assign_rows(mask, category_name):
+            categories[mask] = category_name
+            pending[mask] = False
+        
         # Method 4: Amount-based heuristics
-        amount_match = self._amount_based_heuristics(description_lower, amount, transaction_type)
-        if amount_match:
-            return amount_match
+        is_debit = transaction_types == 'DR'
+        has_atm = unique_descriptions.str.contains('atm', regex=False).to_numpy(dtype=bool)
+        atm_match = has_atm[codes] & np.isin(np.round(amounts), list(ATM_AMOUNTS))
+        assign_rows(pending & atm_match, 'cash_withdrawal')
+        food_match = (is_debit & (amounts < 1000)
+                      & unique_descriptions.str.contains(FOOD_PATTERN).to_numpy(dtype=bool)[codes])
+        assign_rows(pending & food_match, 'food_expense')
+        transport_match = (is_debit & (amounts <= 500)
+                           & unique_descriptions.str.contains(TRANSPORT_PATTERN).to_numpy(dtype=bool)[codes])
+        assign_rows(pending & transport_match, 'transport_expense')
         
         # Method 5: Default based on transaction type
-        return self._get_default_category(transaction_type)
+        credit = transaction_types == 'CR'
+        assign_rows(pending & credit, self._get_default_category('CR'))
+        assign_rows(pending, self._get_default_category('DR'))
+        
+        # Confidence scores, computed once per distinct description in each category
+        confidence_scores = np.empty(len(descriptions), dtype=float)
+        for category in pd.unique(categories):
+            rows = np.flatnonzero(categories == category)
+            desc_codes, inverse = np.unique(codes[rows], return_inverse=True)
+            confidence = self._calculate_confidence_batch(unique_descriptions.iloc[desc_codes], category)
+            confidence_scores[rows] = confidence[inverse]
+        
+        return categories, confidence_scores
     
     def _exact_keyword_match(self, description: str) -> Optional[str]:
         """Match using exact keywords with priority handling"""
-        matched_categories = []
+        if self.keyword_database is not None and description.isascii():
+            return self._scan_keyword_database(description)
         
-        for category_name, category_data in self.categories.items():
-            keywords = category_data.get('keywords', [])
-            priority = category_data.get('priority', 1)
-            
-            for keyword in keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', description):
-                    matched_categories.append((category_name, priority))
-                    break  # One match per category is enough
+        if self.any_keyword_pattern is None or not self.any_keyword_pattern.search(description):
+            return None
         
-        if matched_categories:
-            # Return highest priority match
-            matched_categories.sort(key=lambda x: x[1])
-            return matched_categories[0][0]
+        # First hit in priority order is the highest priority match
+        for category_name, word_pattern in self._categories_by_priority:
+            if word_pattern.search(description):
+                return category_name
         
         return None
     
+    def _scan_keyword_database(self, description: str) -> Optional[str]:
+        """Best keyword category for an ASCII description via Hyperscan"""
+        matched_ids = []
+        top_ids = self.keyword_database_top_ids
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched_ids.append(pattern_id)
+            # Returning True stops the scan once the best possible match is found
+            return pattern_id < top_ids
+        
+        try:
+            self.keyword_database.scan(description.encode('ascii'), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        
+        return self.keyword_database_categories[min(matched_ids)] if matched_ids else None
+    
     def _pattern_match(self, description: str) -> Optional[str]:
         """Match using regex patterns"""
-        for category_name, category_data in self.categories.items():
-            patterns = category_data.get('patterns', [])
-            for pattern in patterns:
-                if re.search(pattern, description, re.IGNORECASE):
-                    return category_name
+        for category_name, regex_patterns in self.category_regex_patterns.items():
+            if any(regex_pattern.search(description) for regex_pattern in regex_patterns):
+                return category_name
         return None
     
     def _similarity_match(self, description: str, threshold: float = 0.3) -> Optional[str]:
-        """Match using TF-IDF cosine similarity"""
+        """Match using cosine similarity of hashed term vectors"""
         try:
             if self.keyword_matrix is None:
                 return None
             
-            # Transform description to TF-IDF
+            # Hash description into the keyword vector space
             desc_vector = self.vectorizer.transform([description])
             
             # Calculate cosine similarity with all keywords
@@ -214,26 +525,48 @@ class RuleEngine:
             print(f"Error in similarity matching: {e}")
             return None
     
+    def _similarity_match_batch(self, descriptions: pd.Series, threshold: float = 0.3) -> np.ndarray:
+        """
+        Batched _similarity_match: one sparse matmul against the keyword matrix
+        
+        Returns an object array holding the best category per description,
+        or None where no keyword is similar enough
+        """
+        best_categories = np.full(len(descriptions), None, dtype=object)
+        try:
+            if self.keyword_matrix is None or len(descriptions) == 0:
+                return best_categories
+            
+            # Hashed rows are L2-normalized, so the dot product is the cosine similarity
+            similarities = self.vectorizer.transform(descriptions.to_numpy()) @ self.keyword_matrix.T
+            best_idx = np.asarray(similarities.argmax(axis=1)).ravel()
+            best_similarity = similarities.max(axis=1).toarray().ravel()
+            
+            matched = best_similarity > threshold
+            best_categories[matched] = np.take(self._category_arr, best_idx[matched])
+            return best_categories
+            
+        except Exception as e:
+            print(f"Error in similarity matching: {e}")
+            return best_categories
+    
     def _amount_based_heuristics(self, description: str, amount: float, transaction_type: str) -> Optional[str]:
         """Use amount-based heuristics for categorization"""
         # Round amounts for common transaction types
         rounded_amount = round(amount)
         
         # Common ATM withdrawal amounts
-        atm_amounts = [500, 1000, 2000, 5000, 10000, 20000]
-        if 'atm' in description and rounded_amount in atm_amounts:
+        if 'atm' in description and rounded_amount in ATM_AMOUNTS:
             return 'cash_withdrawal'
         
         # Common food expense patterns
         if transaction_type == 'DR' and amount < 1000:
-            food_indicators = ['cafe', 'restaurant', 'food', 'meal', 'snack']
-            if any(indicator in description for indicator in food_indicators):
+            if FOOD_PATTERN.search(description):
                 return 'food_expense'
         
         # Common transport amounts
         if transaction_type == 'DR' and amount <= 500:
-            transport_indicators = ['fuel', 'petrol', 'bus', 'taxi', 'uber']
-            if any(indicator in description for indicator in transport_indicators):
+            if TRANSPORT_PATTERN.search(description):
                 return 'transport_expense'
         
         return None
@@ -260,55 +593,58 @@ class RuleEngine:
     def add_custom_category(self, category_name: str, keywords: List[str], 
                           account_name: str, category_type: str = 'expense', priority: int = 1):
         """Add custom category to the engine"""
+        replaces_existing = category_name in self.categories
         self.categories[category_name] = {
             'keywords': keywords,
             'account_name': account_name,
             'type': category_type,
             'priority': priority
         }
-        # Rebuild keyword matrix
-        self._build_keyword_matrix()
+        
+        # New categories only add rows; a replaced one needs its old rows dropped
+        if replaces_existing:
+            self._build_keyword_matrix()
+        else:
+            self._append_keywords(category_name, keywords)
+        self._build_keyword_patterns()
+        self._text_match_cached.cache_clear()
     
-    def categorize_dataframe(self, transactions_df: pd.DataFrame, use_ai: bool = False) -> pd.DataFrame:
-        """Categorize all transactions in a DataFrame"""
-        categorized_df = transactions_df.copy()
-        
-        categories = []
-        confidence_scores = []
-        
-        for _, transaction in categorized_df.iterrows():
-            category = self.categorize_transaction(
-                transaction['description'],
-                transaction['amount'],
-                transaction['type'],
-                use_ai
-            )
-            categories.append(category)
-            
-            # Calculate confidence score (simple version)
-            confidence = self._calculate_confidence(transaction['description'], category)
-            confidence_scores.append(confidence)
+    def categorize_dataframe(self, transactions_df: pd.DataFrame, use_ai: bool = False,
+                             inplace: bool = False) -> pd.DataFrame:
+        """
+        Categorize all transactions in a DataFrame
+        
+        With inplace=True the two result columns are added to the given
+        frame; otherwise a new frame sharing the original column data is returned.
+        """
+        # Column-wise rule evaluation instead of a per-row loop
+        categories, confidence_scores = self.categorize_batch(
+            transactions_df['description'].to_numpy(),
+            transactions_df['amount'].to_numpy(),
+            transactions_df['type'].to_numpy(),
+            use_ai
+        )
         
-        categorized_df['category'] = categories
-        categorized_df['confidence_score'] = confidence_scores
+        if inplace:
+            transactions_df['category'] = categories
+            transactions_df['confidence_score'] = confidence_scores
+            return transactions_df
         
-        return categorized_df
+        return transactions_df.assign(category=categories, confidence_score=confidence_scores)
     
-    def _calculate_confidence(self, description: str, category: str) -> float:
+    def _calculate_confidence(self, description: str, category: str, lowercased: bool = False) -> float:
         """Calculate confidence score for categorization"""
-        description_lower = description.lower()
-        category_data = self.categories.get(category, {})
-        keywords = category_data.get('keywords', [])
+        description_lower = description if lowercased else description.lower()
         
         # Check for exact keyword matches
-        for keyword in keywords:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', description_lower):
-                return 0.9  # High confidence for exact matches
+        word_pattern = self.category_word_patterns.get(category)
+        if word_pattern is not None and word_pattern.search(description_lower):
+            return 0.9  # High confidence for exact matches
         
         # Check for partial matches
-        for keyword in keywords:
-            if keyword in description_lower:
-                return 0.7  # Medium confidence for partial matches
+        keyword_pattern = self.keyword_patterns.get(category)
+        if keyword_pattern is not None and keyword_pattern.search(description_lower):
+            return 0.7  # Medium confidence for partial matches
         
         # Low confidence for default categories
         if category in ['miscellaneous', 'donation_income']:
@@ -316,6 +652,24 @@ class RuleEngine:
         
         return 0.5  # Default confidence
     
+    def _calculate_confidence_batch(self, descriptions: pd.Series, category: str) -> np.ndarray:
+        """Vectorized _calculate_confidence for lowercase descriptions sharing a category"""
+        # Low confidence for default categories
+        if category in ['miscellaneous', 'donation_income']:
+            default_confidence = 0.3
+        else:
+            default_confidence = 0.5
+        confidence = np.full(len(descriptions), default_confidence)
+        
+        if category in self.category_word_patterns:
+            # Check for partial matches, then exact keyword matches on top
+            partial = descriptions.str.contains(self.keyword_patterns[category])
+            confidence[partial.to_numpy(dtype=bool)] = 0.7
+            exact = descriptions.str.contains(self.category_word_patterns[category])
+            confidence[exact.to_numpy(dtype=bool)] = 0.9
+        
+        return confidence
+    
     def get_categorization_stats(self, transactions_df: pd.DataFrame) -> Dict[str, Any]:
         """Get statistics about categorization results"""
         if 'category' not in transactions_df.columns:
@@ -1,21 +1,51 @@
 import json
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from .settings import get_config_path
 
+# orjson parses UTF-8 bytes directly and is much faster; fall back to json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 class ConfigLoader:
-    """Load and manage configuration files"""
+    """Load and manage configuration files
+    
+    Each file is parsed on first access, so consumers only pay for what they use
+    """
     
     def __init__(self):
-        self.categories = self._load_categories()
-        self.account_mapping = self._load_account_mapping()
-        self.bank_patterns = self._load_bank_patterns()
+        # Per-instance lookup caches, so reload() only affects this loader
+        self._account_names_cached = lru_cache(maxsize=256)(self._get_account_names)
+        self._find_category_lower = lru_cache(maxsize=8192)(self._match_category)
+    
+    @cached_property
+    def categories(self):
+        return self._load_categories()
+    
+    @cached_property
+    def account_mapping(self):
+        return self._load_account_mapping()
+    
+    @cached_property
+    def bank_patterns(self):
+        return self._load_bank_patterns()
+    
+    def reload(self):
+        """Drop parsed configs and cached lookups so files are read again"""
+        for name in ('categories', 'account_mapping', 'bank_patterns'):
+            self.__dict__.pop(name, None)
+        self._account_names_cached.cache_clear()
+        self._find_category_lower.cache_clear()
     
     def _load_categories(self):
         """Load categories configuration"""
         try:
-            with open(get_config_path('categories.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(get_config_path('categories.json'), 'rb') as f:
+                return _json_loads(f.read())
         except FileNotFoundError:
             print("Warning: categories.json not found, using default categories")
             return self._get_default_categories()
@@ -26,8 +56,8 @@ class ConfigLoader:
     def _load_account_mapping(self):
         """Load account mapping configuration"""
         try:
-            with open(get_config_path('account_mapping.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(get_config_path('account_mapping.json'), 'rb') as f:
+                return _json_loads(f.read())
         except FileNotFoundError:
             print("Warning: account_mapping.json not found, using default mapping")
             return self._get_default_account_mapping()
@@ -38,8 +68,8 @@ class ConfigLoader:
     def _load_bank_patterns(self):
         """Load bank patterns configuration"""
         try:
-            with open(get_config_path('bank_patterns.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(get_config_path('bank_patterns.json'), 'rb') as f:
+                return _json_loads(f.read())
         except FileNotFoundError:
             print("Warning: bank_patterns.json not found")
             return {}
@@ -86,6 +116,12 @@ class ConfigLoader:
     
     def get_account_names(self, category_name):
         """Get debit and credit account names for a category"""
+        account_names = self._account_names_cached(category_name)
+        # Callers get their own copy so the cached mapping cannot be changed through them
+        return dict(account_names) if isinstance(account_names, dict) else account_names
+    
+    def _get_account_names(self, category_name):
+        """Uncached lookup behind get_account_names"""
         category = self.get_category(category_name)
         if not category:
             return None
@@ -110,7 +146,10 @@ class ConfigLoader:
     
     def find_category(self, description):
         """Find the best matching category for a description"""
-        description_lower = description.lower()
+        return self._find_category_lower(description.lower())
+    
+    def _match_category(self, description_lower):
+        """find_category for an already lowercased description (cached per instance as _find_category_lower)"""
         best_match = None
         best_score = 0
         
@@ -1,38 +1,66 @@
 import pandas as pd
+import numpy as np
 from typing import List, Dict, Any
 import csv
 import io
+import importlib.util
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# pyarrow is optional and only imported when one of its fast paths is used
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+def journal_entries_to_dataframe(journal_entries: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Convert journal entry dicts to a DataFrame, building the columns in pyarrow when installed"""
+    if PYARROW_AVAILABLE and journal_entries:
+        import pyarrow as pa
+        
+        # from_pylist takes its columns from the first entry; pandas unions all keys
+        first_keys = journal_entries[0].keys()
+        if all(entry.keys() == first_keys for entry in journal_entries):
+            try:
+                return pa.Table.from_pylist(journal_entries).to_pandas()
+            except (pa.ArrowException, TypeError, ValueError):
+                # Values of mixed types in one column; let pandas infer an object column
+                pass
+    
+    return pd.DataFrame(journal_entries)
 
 class CSVExporter:
     """Export data to CSV format with proper formatting"""
     
-    def __init__(self):
+    def __init__(self, engine: str = 'pandas'):
+        """
+        Args:
+            engine: 'pandas' (default) or 'pyarrow' to use pyarrow's multi-threaded
+                    C++ CSV writer for file exports when it is installed
+        """
         self.encoding = 'utf-8'
+        self.engine = engine
     
     def export_transactions_to_csv(self, transactions_df: pd.DataFrame, output_path: str) -> str:
         """Export transactions to CSV file"""
         try:
-            # Create a copy to avoid modifying original
-            export_df = transactions_df.copy()
+            formatted = {}
             
             # Format dates
-            if 'date' in export_df.columns:
-                export_df['date'] = export_df['date'].apply(
-                    lambda x: x.strftime('%d/%m/%Y') if hasattr(x, 'strftime') else str(x)
-                )
+            if 'date' in transactions_df.columns:
+                formatted['date'] = self._format_dates(transactions_df['date'])
             
             # Format amounts
-            if 'amount' in export_df.columns:
-                export_df['amount'] = export_df['amount'].apply(
-                    lambda x: f"{x:,.2f}" if isinstance(x, (int, float)) else str(x)
-                )
+            if 'amount' in transactions_df.columns:
+                formatted['amount'] = self._format_amounts(transactions_df['amount'])
             
-            export_df.to_csv(output_path, index=False, encoding=self.encoding)
-            print(f"Transactions exported to CSV: {output_path}")
+            # Only the formatted columns are new; the original frame is not modified or copied
+            export_df = transactions_df.assign(**formatted)
+            self._write_csv(export_df, output_path)
+            logger.info("Transactions exported to CSV: %s", output_path)
             return output_path
             
-        except Exception as e:
-            print(f"Error exporting transactions to CSV: {e}")
+        except Exception:
+            logger.exception("Error exporting transactions to CSV")
             raise
     
     def export_journal_to_csv(self, journal_entries: List[Dict[str, Any]], output_path: str) -> str:
@@ -42,36 +70,73 @@ class CSVExporter:
                 raise ValueError("No journal entries to export")
             
             # Convert to DataFrame
-            journal_df = pd.DataFrame(journal_entries)
+            journal_df = journal_entries_to_dataframe(journal_entries)
             
             # Format dates
             if 'date' in journal_df.columns:
-                journal_df['date'] = journal_df['date'].apply(
-                    lambda x: x.strftime('%d/%m/%Y') if hasattr(x, 'strftime') else str(x)
-                )
+                journal_df['date'] = self._format_dates(journal_df['date'])
             
-            journal_df.to_csv(output_path, index=False, encoding=self.encoding)
-            print(f"Journal entries exported to CSV: {output_path}")
+            self._write_csv(journal_df, output_path)
+            logger.info("Journal entries exported to CSV: %s", output_path)
             return output_path
             
-        except Exception as e:
-            print(f"Error exporting journal entries to CSV: {e}")
+        except Exception:
+            logger.exception("Error exporting journal entries to CSV")
             raise
     
+    def _write_csv(self, df: pd.DataFrame, output_path: str):
+        """Write a formatted DataFrame to disk with the configured engine"""
+        if self.engine == 'pyarrow' and PYARROW_AVAILABLE and self.encoding.lower() in ('utf-8', 'utf8'):
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                # Mixed-type object columns cannot become Arrow columns; use pandas
+                logger.warning("pyarrow CSV writer unavailable for this data, using pandas: %s", e)
+            else:
+                pacsv.write_csv(table, output_path, write_options=pacsv.WriteOptions(include_header=True))
+                return
+        
+        df.to_csv(output_path, index=False, encoding=self.encoding)
+    
+    def _format_dates(self, dates: pd.Series) -> pd.Series:
+        """Format a date column as dd/mm/yyyy, leaving non-date values as text"""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates.dt.strftime('%d/%m/%Y')
+        
+        # Mixed object column: format each distinct value once
+        codes, uniques = pd.factorize(dates)
+        formatted = np.array(
+            [x.strftime('%d/%m/%Y') if hasattr(x, 'strftime') else str(x) for x in uniques] + [None],
+            dtype=object
+        )[codes]
+        
+        # Missing values (None / NaN) are not deduplicated; render them as before
+        missing = codes == -1
+        if missing.any():
+            formatted[missing] = [str(x) for x in dates.to_numpy()[missing]]
+        return pd.Series(formatted, index=dates.index, name=dates.name)
+    
+    def _format_amounts(self, amounts: pd.Series) -> pd.Series:
+        """Format an amount column with thousands separators and 2 decimals"""
+        if isinstance(amounts.dtype, np.dtype) and amounts.dtype.kind in 'biuf':
+            return amounts.map('{:,.2f}'.format)
+        return amounts.map(lambda x: f"{x:,.2f}" if isinstance(x, (int, float)) else str(x))
+    
     def export_to_csv_buffer(self, data: pd.DataFrame) -> bytes:
         """Export DataFrame to CSV bytes buffer"""
-        try:
-            output = io.StringIO()
-            data.to_csv(output, index=False, encoding=self.encoding)
-            return output.getvalue().encode(self.encoding)
-        except Exception as e:
-            print(f"Error creating CSV buffer: {e}")
-            raise
+        # pandas encodes straight into the binary buffer, no intermediate str
+        output = io.BytesIO()
+        data.to_csv(output, index=False, encoding=self.encoding)
+        return output.getvalue()
     
     def export_multiple_sheets_to_csv(self, data_dict: Dict[str, pd.DataFrame], 
-                                    output_dir: str, base_filename: str) -> List[str]:
-        """Export multiple DataFrames to separate CSV files"""
-        exported_files = []
+                                    output_dir: str, base_filename: str,
+                                    max_workers: int = 4) -> List[str]:
+        """Export multiple DataFrames to separate CSV files in parallel"""
+        jobs = []
         
         for sheet_name, df in data_dict.items():
             if df.empty:
@@ -79,11 +144,22 @@ class CSVExporter:
                 
             filename = f"{base_filename}_{sheet_name.lower().replace(' ', '_')}.csv"
             filepath = f"{output_dir}/{filename}"
-            
+            jobs.append((sheet_name, df, filepath))
+        
+        if not jobs:
+            return []
+        
+        def export_sheet(job):
+            sheet_name, df, filepath = job
             try:
                 self.export_transactions_to_csv(df, filepath)
-                exported_files.append(filepath)
-            except Exception as e:
-                print(f"Error exporting {sheet_name} to CSV: {e}")
+                return filepath
+            except Exception:
+                logger.exception("Error exporting %s to CSV", sheet_name)
+                return None
+        
+        # Each sheet goes to its own file, so the writes are independent
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            results = list(executor.map(export_sheet, jobs))
         
-        return exported_files
\ No newline at end of file
+        return [filepath for filepath in results if filepath]
\ No newline at end of file
@@ -1,11 +1,26 @@
 import pandas as pd
+import numpy as np
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, numbers
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle, numbers
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.chart import PieChart, BarChart, Reference
 from typing import Dict, List, Any, Optional
-import os
+import re
+import logging
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from .csv_exporter import journal_entries_to_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Any of the substrings that mark a value as date-like, matched in one scan
+DATE_INDICATOR_PATTERN = re.compile(r'[/-]|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec')
+
+# Background worker shared by every writer for export_to_excel_async; its
+# thread is only started by the first submitted export
+_EXPORT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='excel-export')
 
 class ExcelWriter:
     def __init__(self):
@@ -77,50 +92,62 @@ class ExcelWriter:
         """
         Export transactions and journal entries to Excel with professional formatting
         
+        The workbook is written in openpyxl write-only mode, so rows are
+        streamed to the file as they are appended instead of being held as
+        a full cell model in memory.
+        
         Args:
             transactions_df: DataFrame with transactions
             journal_entries: List of journal entries
-            output_path: Output file path
+            output_path: Output file path or writable binary file-like object
             include_charts: Whether to include charts and analysis
             
         Returns:
             Path to created file
         """
         try:
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                workbook = writer.book
-                
-                # Create worksheets
-                self._create_transactions_sheet(workbook, transactions_df, writer)
-                self._create_journal_sheet(workbook, journal_entries, writer)
-                self._create_summary_sheet(workbook, transactions_df, journal_entries, writer)
-                
-                if include_charts:
-                    self._create_analysis_sheet(workbook, transactions_df, journal_entries, writer)
-                
-                # Add formatting
-                self._apply_auto_filters(workbook)
-                
-            print(f"Excel file exported successfully: {output_path}")
+            workbook = Workbook(write_only=True)
+            self._register_named_styles(workbook)
+            
+            # Create worksheets
+            self._create_transactions_sheet(workbook, transactions_df)
+            self._create_journal_sheet(workbook, journal_entries)
+            self._create_summary_sheet(workbook, transactions_df, journal_entries)
+            
+            if include_charts:
+                self._create_analysis_sheet(workbook, transactions_df, journal_entries)
+            
+            workbook.save(output_path)
+            
+            logger.info("Excel file exported successfully: %s", output_path)
             return output_path
             
-        except Exception as e:
-            print(f"Error exporting to Excel: {e}")
+        except Exception:
+            logger.exception("Error exporting to Excel")
             raise
     
-    def _create_transactions_sheet(self, workbook: Workbook, transactions_df: pd.DataFrame, writer):
+    def export_to_excel_async(self, transactions_df: pd.DataFrame, journal_entries: List[Dict[str, Any]], 
+                              output_path: str, include_charts: bool = True) -> Future:
+        """
+        Run export_to_excel on a background thread so the caller is not blocked
+        
+        Exports are queued on a single worker shared by all writers: the sheets
+        of one write-only workbook share its string and style tables, so they
+        are not written in parallel, and no idle thread is left per writer.
+        
+        Returns:
+            Future resolving to the path of the created file
+        """
+        return _EXPORT_EXECUTOR.submit(self.export_to_excel, transactions_df, journal_entries,
+                                       output_path, include_charts)
+    
+    def _create_transactions_sheet(self, workbook: Workbook, transactions_df: pd.DataFrame):
         """Create transactions worksheet"""
         if transactions_df.empty:
             return
         
         # Create transactions sheet
-        sheet = workbook.create_sheet("Transactions", 0)
-        
-        # Add title
-        sheet.merge_cells('A1:H1')
-        sheet['A1'] = "BANK TRANSACTIONS SUMMARY"
-        sheet['A1'].font = Font(size=16, bold=True)
-        sheet['A1'].alignment = Alignment(horizontal='center')
+        sheet = workbook.create_sheet("Transactions")
         
         # Prepare data for export
         export_df = transactions_df.copy()
@@ -131,98 +158,76 @@ class ExcelWriter:
                 lambda x: x.strftime('%d/%m/%Y') if hasattr(x, 'strftime') else str(x)
             )
         
-        # Write data starting from row 3
-        rows = dataframe_to_rows(export_df, index=False, header=True)
-        for r_idx, row in enumerate(rows, 3):
-            for c_idx, value in enumerate(row, 1):
-                sheet.cell(row=r_idx, column=c_idx, value=value)
-        
-        # Apply formatting
-        self._format_data_range(sheet, 3, 1, len(export_df) + 3, len(export_df.columns))
+        # Column widths and filters must be set before the first row is streamed
+        self._auto_adjust_columns(sheet, export_df)
+        self._apply_auto_filter(sheet, export_df)
         
-        # Add headers
-        self._apply_header_formatting(sheet, 3, export_df.columns.tolist())
+        # Add title
+        self._append_title(sheet, "BANK TRANSACTIONS SUMMARY", 'A1:H1')
         
-        # Auto-adjust column widths
-        self._auto_adjust_columns(sheet, export_df)
+        # Write data starting from row 3
+        self._append_data_rows(sheet, export_df)
         
         # Add totals row
-        self._add_totals_row(sheet, export_df, len(export_df) + 4)
+        self._add_totals_row(sheet, export_df)
     
-    def _create_journal_sheet(self, workbook: Workbook, journal_entries: List[Dict[str, Any]], writer):
+    def _create_journal_sheet(self, workbook: Workbook, journal_entries: List[Dict[str, Any]]):
         """Create journal entries worksheet"""
         if not journal_entries:
             return
         
         # Convert to DataFrame
-        journal_df = pd.DataFrame(journal_entries)
+        journal_df = journal_entries_to_dataframe(journal_entries)
         
         # Create journal sheet
-        sheet = workbook.create_sheet("Journal Entries", 1)
+        sheet = workbook.create_sheet("Journal Entries")
+        
+        self._auto_adjust_columns(sheet, journal_df)
+        self._apply_auto_filter(sheet, journal_df)
         
         # Add title
-        sheet.merge_cells('A1:G1')
-        sheet['A1'] = "ACCOUNTING JOURNAL ENTRIES"
-        sheet['A1'].font = Font(size=16, bold=True)
-        sheet['A1'].alignment = Alignment(horizontal='center')
+        self._append_title(sheet, "ACCOUNTING JOURNAL ENTRIES", 'A1:G1')
         
         # Write data starting from row 3
-        rows = dataframe_to_rows(journal_df, index=False, header=True)
-        for r_idx, row in enumerate(rows, 3):
-            for c_idx, value in enumerate(row, 1):
-                sheet.cell(row=r_idx, column=c_idx, value=value)
-        
-        # Apply formatting
-        self._format_data_range(sheet, 3, 1, len(journal_df) + 3, len(journal_df.columns))
-        self._apply_header_formatting(sheet, 3, journal_df.columns.tolist())
-        self._auto_adjust_columns(sheet, journal_df)
+        self._append_data_rows(sheet, journal_df)
     
     def _create_summary_sheet(self, workbook: Workbook, transactions_df: pd.DataFrame, 
-                            journal_entries: List[Dict[str, Any]], writer):
+                            journal_entries: List[Dict[str, Any]]):
         """Create summary worksheet"""
-        sheet = workbook.create_sheet("Summary", 2)
+        sheet = workbook.create_sheet("Summary")
+        sheet.column_dimensions['A'].width = 25
+        sheet.column_dimensions['B'].width = 20
         
         # Add title
-        sheet.merge_cells('A1:D1')
-        sheet['A1'] = "FINANCIAL SUMMARY"
-        sheet['A1'].font = Font(size=16, bold=True)
-        sheet['A1'].alignment = Alignment(horizontal='center')
+        self._append_title(sheet, "FINANCIAL SUMMARY", 'A1:D1')
         
         # Calculate summary statistics
         summary_data = self._calculate_summary_data(transactions_df, journal_entries)
         
         # Write summary data
-        row_idx = 3
-        sheet.cell(row=row_idx, column=1, value="Metric")
-        sheet.cell(row=row_idx, column=2, value="Value")
+        sheet.append([self._styled_cell(sheet, "Metric", 'header'),
+                      self._styled_cell(sheet, "Value", 'header')])
         
         for key, value in summary_data.items():
-            row_idx += 1
-            sheet.cell(row=row_idx, column=1, value=key.replace('_', ' ').title())
-            
+            label = self._styled_cell(sheet, key.replace('_', ' ').title(), 'text')
             if isinstance(value, (int, float)):
-                sheet.cell(row=row_idx, column=2, value=value)
-                if 'amount' in key.lower() or 'total' in key.lower():
-                    sheet.cell(row=row_idx, column=2).number_format = '#,##0.00'
+                value_cell = self._styled_cell(sheet, value, 'amount')
             else:
-                sheet.cell(row=row_idx, column=2, value=str(value))
-        
-        # Format summary
-        self._format_summary_sheet(sheet, len(summary_data) + 3)
+                value_cell = self._styled_cell(sheet, str(value), 'text')
+            sheet.append([label, value_cell])
     
     def _create_analysis_sheet(self, workbook: Workbook, transactions_df: pd.DataFrame, 
-                             journal_entries: List[Dict[str, Any]], writer):
+                             journal_entries: List[Dict[str, Any]]):
         """Create analysis worksheet with charts"""
         if transactions_df.empty:
             return
         
-        sheet = workbook.create_sheet("Analysis", 3)
+        sheet = workbook.create_sheet("Analysis")
+        sheet.column_dimensions['A'].width = 25
+        sheet.column_dimensions['B'].width = 20
         
         # Add title
-        sheet.merge_cells('A1:D1')
-        sheet['A1'] = "FINANCIAL ANALYSIS"
-        sheet['A1'].font = Font(size=16, bold=True)
-        sheet['A1'].alignment = Alignment(horizontal='center')
+        self._append_title(sheet, "FINANCIAL ANALYSIS", 'A1:D1')
         
         # Category analysis
         if 'category' in transactions_df.columns:
@@ -230,12 +235,11 @@ class ExcelWriter:
             category_totals = category_totals.sort_values('amount', ascending=False)
             
             # Write category analysis
-            sheet.cell(row=3, column=1, value="Category")
-            sheet.cell(row=3, column=2, value="Total Amount")
+            sheet.append(["Category", "Total Amount"])
             
-            for idx, (_, row) in enumerate(category_totals.iterrows(), 4):
-                sheet.cell(row=idx, column=1, value=row['category'])
-                sheet.cell(row=idx, column=2, value=row['amount'])
+            for category, amount in zip(category_totals['category'].tolist(),
+                                        category_totals['amount'].tolist()):
+                sheet.append([category, amount])
             
             # Create pie chart
             if len(category_totals) > 0:
@@ -246,9 +250,6 @@ class ExcelWriter:
                 chart.set_categories(labels)
                 chart.title = "Expense/Income by Category"
                 sheet.add_chart(chart, "D3")
-        
-        # Format analysis sheet
-        self._format_analysis_sheet(sheet)
     
     def _calculate_summary_data(self, transactions_df: pd.DataFrame, journal_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate summary statistics"""
@@ -257,14 +258,18 @@ class ExcelWriter:
         if not transactions_df.empty:
             # Basic transaction stats
             summary['total_transactions'] = len(transactions_df)
-            summary['total_credit_amount'] = transactions_df[transactions_df['type'] == 'CR']['amount'].sum()
-            summary['total_debit_amount'] = transactions_df[transactions_df['type'] == 'DR']['amount'].sum()
+            # One grouped pass instead of a boolean mask per transaction type
+            type_totals = transactions_df.groupby('type', observed=True)['amount'].sum()
+            summary['total_credit_amount'] = type_totals.get('CR', 0.0)
+            summary['total_debit_amount'] = type_totals.get('DR', 0.0)
             summary['net_balance'] = summary['total_credit_amount'] - summary['total_debit_amount']
             
             # Date range
             if 'date' in transactions_df.columns:
                 try:
-                    dates = pd.to_datetime(transactions_df['date'])
+                    dates = transactions_df['date']
+                    if not pd.api.types.is_datetime64_any_dtype(dates):
+                        dates = pd.to_datetime(dates, cache=True)
                     summary['start_date'] = dates.min().strftime('%d/%m/%Y')
                     summary['end_date'] = dates.max().strftime('%d/%m/%Y')
                 except:
@@ -285,50 +290,93 @@ class ExcelWriter:
         
         return summary
     
-    def _format_data_range(self, sheet, start_row, start_col, end_row, end_col):
-        """Apply formatting to data range"""
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                cell = sheet.cell(row=row, column=col)
-                
-                # Apply appropriate style based on content
-                if row == start_row:  # Header row
-                    self._apply_style(cell, self.styles['header'])
-                elif isinstance(cell.value, (int, float)) and cell.value != 0:
-                    if 'debit' in str(cell.value).lower() or (isinstance(cell.value, (int, float)) and cell.value < 0):
-                        self._apply_style(cell, self.styles['debit'])
-                    else:
-                        self._apply_style(cell, self.styles['amount'])
-                elif self._looks_like_date(cell.value):
-                    self._apply_style(cell, self.styles['date'])
-                else:
-                    self._apply_style(cell, self.styles['text'])
+    def _append_title(self, sheet, title, merge_range):
+        """Append the sheet title row and the blank row below it"""
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.font = Font(size=16, bold=True)
+        cell.alignment = Alignment(horizontal='center')
+        sheet.merged_cells.add(merge_range)
+        sheet.append([cell])
+        sheet.append([])
+    
+    def _append_data_rows(self, sheet, df):
+        """Stream the header and data rows with their styles attached"""
+        sheet.append([self._styled_cell(sheet, str(header).replace('_', ' ').title(), 'header')
+                      for header in df.columns])
+        
+        column_styles = [self._column_styles(df.iloc[:, col_idx]) for col_idx in range(len(df.columns))]
+        rows = dataframe_to_rows(df, index=False, header=False)
+        for row, row_styles in zip(rows, zip(*column_styles)):
+            sheet.append([self._styled_cell(sheet, value, style_name)
+                          for value, style_name in zip(row, row_styles)])
+    
+    def _column_styles(self, column):
+        """
+        Decide the style name of every cell in a column at once
+        
+        Numeric columns only need the sign of each value; other columns are
+        classified once per distinct value instead of once per cell.
+        """
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in 'iuf':
+            values = column.to_numpy()
+            return np.where(values < 0, 'debit', np.where(values == 0, 'text', 'amount'))
+        
+        codes, uniques = pd.factorize(column)
+        unique_styles = np.array([self._data_style(value) for value in uniques] + ['text'], dtype=object)
+        styles = unique_styles[codes]
+        # Missing values are not among the uniques; classify them one by one
+        for position in np.flatnonzero(codes == -1):
+            styles[position] = self._data_style(column.iloc[position])
+        return styles
+    
+    def _data_style(self, value):
+        """Pick the style name for a data cell based on its content"""
+        if isinstance(value, (int, float)) and value != 0:
+            return 'debit' if value < 0 else 'amount'
+        if self._looks_like_date(value):
+            return 'date'
+        return 'text'
     
-    def _apply_header_formatting(self, sheet, header_row, headers):
-        """Apply formatting to header row"""
-        for col_idx, header in enumerate(headers, 1):
-            cell = sheet.cell(row=header_row, column=col_idx)
-            cell.value = header.replace('_', ' ').title()
-            self._apply_style(cell, self.styles['header'])
+    def _register_named_styles(self, workbook):
+        """Register every predefined style with the workbook as a named style"""
+        for style_name, style in self.styles.items():
+            named_style = NamedStyle(name=style_name)
+            self._apply_style(named_style, style)
+            workbook.add_named_style(named_style)
+    
+    def _styled_cell(self, sheet, value, style_name):
+        """
+        Create a write-only cell carrying one of the predefined styles
+        
+        The cell references the named style registered with the workbook, so
+        font, fill, border and alignment are resolved once per workbook
+        instead of once per cell.
+        """
+        cell = WriteOnlyCell(sheet, value=value)
+        number_format = cell.number_format
+        cell.style = style_name
+        if 'number_format' not in self.styles[style_name]:
+            # Keep the format openpyxl picked for the value (e.g. dates)
+            cell.number_format = number_format
+        return cell
     
     def _apply_style(self, cell, style):
-        """Apply style dictionary to cell"""
+        """Apply style dictionary to a cell or named style"""
         for attr, value in style.items():
             setattr(cell, attr, value)
     
     def _auto_adjust_columns(self, sheet, df):
         """Auto-adjust column widths based on content"""
         for col_idx, column in enumerate(df.columns, 1):
-            max_length = 0
-            column_letter = self._get_column_letter(col_idx)
+            column_letter = get_column_letter(col_idx)
             
             # Check header length
-            max_length = max(max_length, len(str(column)))
+            max_length = len(str(column))
             
             # Check data length
-            for row in range(1, min(len(df) + 2, 1000)):  # Limit to first 1000 rows for performance
+            # Limit to first 1000 rows for performance; tolist() hands back plain Python values
+            for cell_value in df.iloc[:1000, col_idx - 1].tolist():
                 try:
-                    cell_value = sheet.cell(row=row, column=col_idx).value
                     if cell_value:
                         max_length = max(max_length, len(str(cell_value)))
                 except:
@@ -337,83 +385,32 @@ class ExcelWriter:
             adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
             sheet.column_dimensions[column_letter].width = adjusted_width
     
-    def _get_column_letter(self, col_idx):
-        """Convert column index to letter (1->A, 2->B, etc.)"""
-        result = ""
-        while col_idx > 0:
-            col_idx, remainder = divmod(col_idx - 1, 26)
-            result = chr(65 + remainder) + result
-        return result
-    
-    def _add_totals_row(self, sheet, df, totals_row):
+    def _add_totals_row(self, sheet, df):
         """Add totals row to transactions"""
         if 'amount' in df.columns:
             total_amount = df['amount'].sum()
-            sheet.cell(row=totals_row, column=1, value="TOTAL")
-            sheet.cell(row=totals_row, column=df.columns.get_loc('amount') + 1, value=total_amount)
-            self._apply_style(sheet.cell(row=totals_row, column=df.columns.get_loc('amount') + 1), self.styles['total'])
+            totals = [None] * len(df.columns)
+            totals[0] = "TOTAL"
+            totals[df.columns.get_loc('amount')] = self._styled_cell(sheet, total_amount, 'total')
+            sheet.append(totals)
     
-    def _format_summary_sheet(self, sheet, data_rows):
-        """Format summary sheet"""
-        # Apply formatting to summary data
-        for row in range(3, data_rows + 1):
-            for col in range(1, 3):
-                cell = sheet.cell(row=row, column=col)
-                if row == 3:  # Header
-                    self._apply_style(cell, self.styles['header'])
-                elif col == 2 and isinstance(cell.value, (int, float)):
-                    self._apply_style(cell, self.styles['amount'])
-                else:
-                    self._apply_style(cell, self.styles['text'])
-        
-        # Auto-adjust columns
-        sheet.column_dimensions['A'].width = 25
-        sheet.column_dimensions['B'].width = 20
-    
-    def _format_analysis_sheet(self, sheet):
-        """Format analysis sheet"""
-        # Auto-adjust columns
-        sheet.column_dimensions['A'].width = 25
-        sheet.column_dimensions['B'].width = 20
-    
-    def _apply_auto_filters(self, workbook):
-        """Apply auto-filters to data sheets"""
-        for sheet_name in ['Transactions', 'Journal Entries']:
-            if sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                # Find the data range (skip title rows)
-                max_row = sheet.max_row
-                max_col = sheet.max_column
-                if max_row > 3 and max_col > 0:
-                    sheet.auto_filter.ref = f"A3:{self._get_column_letter(max_col)}{max_row}"
+    def _apply_auto_filter(self, sheet, df):
+        """Apply an auto-filter over the header and data rows (title rows skipped)"""
+        if len(df) > 0 and len(df.columns) > 0:
+            sheet.auto_filter.ref = f"A3:{get_column_letter(len(df.columns))}{len(df) + 3}"
     
     def _looks_like_date(self, value):
         """Check if value looks like a date"""
         if not value:
             return False
-        date_indicators = ['/', '-', 'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                          'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-        value_str = str(value).lower()
-        return any(indicator in value_str for indicator in date_indicators)
+        return DATE_INDICATOR_PATTERN.search(str(value).lower()) is not None
     
     def export_to_excel_buffer(self, transactions_df: pd.DataFrame, journal_entries: List[Dict[str, Any]]) -> bytes:
         """Export to Excel and return as bytes buffer"""
-        import tempfile
         import io
         
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                self.export_to_excel(transactions_df, journal_entries, tmp_file.name, include_charts=False)
-                
-                # Read the file back into memory
-                with open(tmp_file.name, 'rb') as f:
-                    excel_buffer = io.BytesIO(f.read())
-                
-                # Clean up
-                os.unlink(tmp_file.name)
-                
-                return excel_buffer.getvalue()
-                
-        except Exception as e:
-            print(f"Error creating Excel buffer: {e}")
-            raise
\ No newline at end of file
+        # Workbook.save accepts file-like objects, so no temporary file is needed;
+        # export_to_excel already logs any failure
+        excel_buffer = io.BytesIO()
+        self.export_to_excel(transactions_df, journal_entries, excel_buffer, include_charts=False)
+        return excel_buffer.getvalue()
\ No newline at end of file
@@ -1,30 +1,98 @@
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
-from reportlab.lib.units import inch, cm
+from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 import pandas as pd
 from datetime import datetime
-import os
 import io
 
+# Rupee amounts with thousands separators, e.g. ₹1,234.50
+CURRENCY_FORMAT = "₹{:,.2f}".format
+
 class PDFGenerator:
+    # Style sheet shared by all generators, built on first use
+    _shared_styles = None
+    
+    # Table styles are only read by Table.setStyle, so one instance serves every report
+    _JOURNAL_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ])
+    
+    _SUMMARY_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#d5f4e6')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ])
+    
+    _TRANSACTIONS_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    
+    _CATEGORY_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ])
+    
+    # Journal rows per table; reportlab lays out many short tables much faster than one long one
+    JOURNAL_TABLE_CHUNK_ROWS = 100
+    
+    # Page header/footer colours, drawn on every page
+    _HEADER_COLOR = colors.HexColor('#2c3e50')
+    _FOOTER_COLOR = colors.HexColor('#7f8c8d')
+    
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        self.styles = self._get_styles()
         self.page_size = A4
+        self._set_report_time()
     
-    def _create_custom_styles(self):
+    def _set_report_time(self):
+        """Take the generation timestamp once per report; every page footer reuses it"""
+        self._report_time = datetime.now()
+        self._footer_date = self._report_time.strftime('%d/%m/%Y')
+    
+    @classmethod
+    def _get_styles(cls):
+        """Return the shared style sheet, building it once per process"""
+        if cls._shared_styles is None:
+            styles = getSampleStyleSheet()
+            cls._create_custom_styles(styles)
+            cls._shared_styles = styles
+        return cls._shared_styles
+    
+    @staticmethod
+    def _create_custom_styles(styles):
         """Create custom paragraph styles"""
         # Title style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=18,
             textColor=colors.HexColor('#2c3e50'),
             spaceAfter=30,
@@ -32,9 +100,9 @@ class PDFGenerator:
         ))
         
         # Header style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=14,
             textColor=colors.HexColor('#34495e'),
             spaceAfter=12,
@@ -42,13 +110,40 @@ class PDFGenerator:
         ))
         
         # Normal style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomNormal',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
             textColor=colors.HexColor('#2c3e50'),
             spaceAfter=6
         ))
+        
+        # Title page styles
+        styles.add(ParagraphStyle(
+            name='ReportTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=30,
+            alignment=1
+        ))
+        
+        styles.add(ParagraphStyle(
+            name='ReportSubtitle',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#7f8c8d'),
+            spaceAfter=20,
+            alignment=1
+        ))
+        
+        styles.add(ParagraphStyle(
+            name='ReportInfo',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#34495e'),
+            alignment=1
+        ))
     
     def generate_journal_pdf(self, journal_entries: List[Dict[str, Any]], output_path: str, 
                            title: str = "Accounting Journal Entries") -> str:
@@ -57,7 +152,7 @@ class PDFGenerator:
         
         Args:
             journal_entries: List of journal entries
-            output_path: Output file path
+            output_path: Output file path or writable binary file-like object
             title: Report title
             
         Returns:
@@ -74,6 +169,7 @@ class PDFGenerator:
             )
             
             elements = []
+            self._set_report_time()
             
             # Add title
             title_para = Paragraph(title, self.styles['CustomTitle'])
@@ -81,7 +177,7 @@ class PDFGenerator:
             elements.append(Spacer(1, 0.2*inch))
             
             # Add generation date
-            date_para = Paragraph(f"Generated on: {datetime.now().strftime('%d/%m/%Y %H:%M')}", 
+            date_para = Paragraph(f"Generated on: {self._report_time.strftime('%d/%m/%Y %H:%M')}", 
                                 self.styles['CustomNormal'])
             elements.append(date_para)
             elements.append(Spacer(1, 0.3*inch))
@@ -89,9 +185,7 @@ class PDFGenerator:
             # Create journal entries table
             if journal_entries:
                 table_data = self._prepare_journal_table_data(journal_entries)
-                journal_table = Table(table_data, colWidths=[1*inch, 2.5*inch, 2.5*inch, 3*inch])
-                journal_table.setStyle(self._get_journal_table_style())
-                elements.append(journal_table)
+                elements.extend(self._create_journal_tables(table_data, [1*inch, 2.5*inch, 2.5*inch, 3*inch]))
             else:
                 no_data_para = Paragraph("No journal entries available", self.styles['CustomNormal'])
                 elements.append(no_data_para)
@@ -133,6 +227,10 @@ class PDFGenerator:
             )
             
             elements = []
+            self._set_report_time()
+            
+            # Figures shared by the executive summary and the transactions overview
+            summary = self._summarize(transactions_df)
             
             # Title page
             elements.extend(self._create_title_page())
@@ -143,12 +241,12 @@ class PDFGenerator:
             elements.append(Spacer(1, 0.5*inch))
             
             # Executive Summary
-            elements.extend(self._create_executive_summary(transactions_df, journal_entries))
+            elements.extend(self._create_executive_summary(summary, journal_entries))
             elements.append(Spacer(1, 0.3*inch))
             
             # Transactions Summary
             if not transactions_df.empty:
-                elements.extend(self._create_transactions_section(transactions_df))
+                elements.extend(self._create_transactions_section(summary))
                 elements.append(Spacer(1, 0.3*inch))
             
             # Journal Entries
@@ -174,41 +272,16 @@ class PDFGenerator:
         elements = []
         
         # Main title
-        title_style = ParagraphStyle(
-            name='ReportTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=30,
-            alignment=1
-        )
-        
-        elements.append(Paragraph("FINANCIAL TRANSACTION REPORT", title_style))
+        elements.append(Paragraph("FINANCIAL TRANSACTION REPORT", self.styles['ReportTitle']))
         elements.append(Spacer(1, 0.5*inch))
         
         # Subtitle
-        subtitle_style = ParagraphStyle(
-            name='ReportSubtitle',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#7f8c8d'),
-            spaceAfter=20,
-            alignment=1
-        )
-        
-        elements.append(Paragraph("Bank Passbook to Accounting Conversion", subtitle_style))
+        elements.append(Paragraph("Bank Passbook to Accounting Conversion", self.styles['ReportSubtitle']))
         elements.append(Spacer(1, 1*inch))
         
         # Generation info
-        info_style = ParagraphStyle(
-            name='ReportInfo',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#34495e'),
-            alignment=1
-        )
-        
-        elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %H:%M')}", info_style))
+        info_style = self.styles['ReportInfo']
+        elements.append(Paragraph(f"Generated on: {self._report_time.strftime('%B %d, %Y at %H:%M')}", info_style))
         elements.append(Paragraph("Automated Accounting System", info_style))
         
         return elements
@@ -233,7 +306,31 @@ class PDFGenerator:
         
         return elements
     
-    def _create_executive_summary(self, transactions_df: pd.DataFrame, 
+    def _summarize(self, transactions_df: pd.DataFrame) -> Dict[str, Any]:
+        """Compute the transaction totals and counts used by the report sections"""
+        summary = {
+            'total_transactions': len(transactions_df),
+            'total_credit': 0.0,
+            'total_debit': 0.0,
+            'credit_count': 0,
+            'debit_count': 0,
+            'total_amount': 0.0
+        }
+        
+        if not transactions_df.empty:
+            # One grouped pass gives both the per-type sums and the per-type row counts
+            by_type = transactions_df.groupby('type', observed=True)['amount'].agg(['sum', 'size'])
+            if 'CR' in by_type.index:
+                summary['total_credit'] = by_type.at['CR', 'sum']
+                summary['credit_count'] = by_type.at['CR', 'size']
+            if 'DR' in by_type.index:
+                summary['total_debit'] = by_type.at['DR', 'sum']
+                summary['debit_count'] = by_type.at['DR', 'size']
+            summary['total_amount'] = transactions_df['amount'].sum()
+        
+        return summary
+    
+    def _create_executive_summary(self, summary: Dict[str, Any], 
                                 journal_entries: List[Dict[str, Any]]) -> List[Any]:
         """Create executive summary section"""
         elements = []
@@ -241,9 +338,9 @@ class PDFGenerator:
         elements.append(Paragraph("Executive Summary", self.styles['CustomHeader']))
         
         # Calculate summary statistics
-        total_transactions = len(transactions_df) if not transactions_df.empty else 0
-        total_credit = transactions_df[transactions_df['type'] == 'CR']['amount'].sum() if not transactions_df.empty else 0
-        total_debit = transactions_df[transactions_df['type'] == 'DR']['amount'].sum() if not transactions_df.empty else 0
+        total_transactions = summary['total_transactions']
+        total_credit = summary['total_credit']
+        total_debit = summary['total_debit']
         net_balance = total_credit - total_debit
         journal_count = len(journal_entries)
         
@@ -258,7 +355,7 @@ class PDFGenerator:
         
         return elements
     
-    def _create_transactions_section(self, transactions_df: pd.DataFrame) -> List[Any]:
+    def _create_transactions_section(self, summary: Dict[str, Any]) -> List[Any]:
         """Create transactions overview section"""
         elements = []
         
@@ -267,29 +364,16 @@ class PDFGenerator:
         # Create summary table
         summary_data = [['Metric', 'Value']]
         
-        if not transactions_df.empty:
-            credit_count = len(transactions_df[transactions_df['type'] == 'CR'])
-            debit_count = len(transactions_df[transactions_df['type'] == 'DR'])
-            total_amount = transactions_df['amount'].sum()
-            
+        if summary['total_transactions']:
             summary_data.extend([
-                ['Total Transactions', str(len(transactions_df))],
-                ['Credit Transactions', str(credit_count)],
-                ['Debit Transactions', str(debit_count)],
-                ['Total Amount', f"₹{total_amount:,.2f}"]
+                ['Total Transactions', str(summary['total_transactions'])],
+                ['Credit Transactions', str(summary['credit_count'])],
+                ['Debit Transactions', str(summary['debit_count'])],
+                ['Total Amount', CURRENCY_FORMAT(summary['total_amount'])]
             ])
         
         summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        summary_table.setStyle(self._TRANSACTIONS_TABLE_STYLE)
         
         elements.append(summary_table)
         
@@ -309,7 +393,7 @@ class PDFGenerator:
             elements.append(Paragraph(f"Showing first 10 of {len(journal_entries)} entries", 
                                     self.styles['CustomNormal']))
         
-        journal_table = Table(table_data, colWidths=[1*inch, 2*inch, 2*inch, 3*inch])
+        journal_table = Table(table_data, colWidths=[1*inch, 2*inch, 2*inch, 3*inch], repeatRows=1)
         journal_table.setStyle(self._get_journal_table_style())
         elements.append(journal_table)
         
@@ -326,27 +410,19 @@ class PDFGenerator:
                                     self.styles['CustomNormal']))
             return elements
         
-        # Category analysis
-        category_totals = transactions_df.groupby('category')['amount'].sum().reset_index()
-        category_totals = category_totals.sort_values('amount', ascending=False)
+        # Category analysis; stays a Series, no intermediate DataFrame
+        category_totals = transactions_df.groupby('category', observed=True)['amount'].sum()
+        category_totals = category_totals.sort_values(ascending=False)
         
         elements.append(Paragraph("Category-wise Summary", self.styles['Heading3']))
         
         # Create category table
         category_data = [['Category', 'Total Amount']]
-        for _, row in category_totals.iterrows():
-            category_data.append([row['category'], f"₹{row['amount']:,.2f}"])
+        for category, amount in category_totals.items():
+            category_data.append([category, CURRENCY_FORMAT(amount)])
         
         category_table = Table(category_data, colWidths=[3*inch, 2*inch])
-        category_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
+        category_table.setStyle(self._CATEGORY_TABLE_STYLE)
         
         elements.append(category_table)
         
@@ -355,47 +431,55 @@ class PDFGenerator:
     def _prepare_journal_table_data(self, journal_entries: List[Dict[str, Any]]) -> List[List[str]]:
         """Prepare journal entries data for table"""
         table_data = [['Date', 'Debit Account', 'Credit Account', 'Narration']]
+        # Journals repeat the same few dates many times; format each one once
+        formatted_dates = {}
         
         for entry in journal_entries:
             # Format date
-            date_str = entry.get('date', '')
-            if hasattr(date_str, 'strftime'):
-                date_str = date_str.strftime('%d/%m/%Y')
+            date_value = entry.get('date', '')
+            if hasattr(date_value, 'strftime'):
+                date_str = formatted_dates.get(date_value)
+                if date_str is None:
+                    date_str = formatted_dates[date_value] = date_value.strftime('%d/%m/%Y')
+            else:
+                date_str = str(date_value)
+            
+            # Truncate long narrations
+            narration = entry.get('narration', '') or ''
+            if len(narration) > 50:
+                narration = narration[:50] + '...'
             
             table_data.append([
-                str(date_str),
+                date_str,
                 entry.get('debit_account', ''),
                 entry.get('credit_account', ''),
-                entry.get('narration', '')[:50] + '...' if len(entry.get('narration', '')) > 50 else entry.get('narration', '')
+                narration
             ])
         
         return table_data
     
+    def _create_journal_tables(self, table_data: List[List[str]], col_widths: List[float]) -> List[Any]:
+        """Split journal table data into tables of JOURNAL_TABLE_CHUNK_ROWS rows, each with the header"""
+        elements = []
+        header, rows = table_data[0], table_data[1:]
+        chunk_rows = self.JOURNAL_TABLE_CHUNK_ROWS
+        
+        for start in range(0, len(rows), chunk_rows):
+            if elements:
+                elements.append(Spacer(1, 6))
+            journal_table = Table([header] + rows[start:start + chunk_rows], colWidths=col_widths, repeatRows=1)
+            journal_table.setStyle(self._get_journal_table_style())
+            elements.append(journal_table)
+        
+        return elements
+    
     def _get_journal_table_style(self) -> TableStyle:
         """Get table style for journal entries"""
-        return TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ])
+        return self._JOURNAL_TABLE_STYLE
     
     def _get_summary_table_style(self) -> TableStyle:
         """Get table style for summary data"""
-        return TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#d5f4e6')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ])
+        return self._SUMMARY_TABLE_STYLE
     
     def _generate_summary_data(self, journal_entries: List[Dict[str, Any]]) -> List[List[str]]:
         """Generate summary data for PDF"""
@@ -413,37 +497,27 @@ class PDFGenerator:
         
         # Header
         canvas.setFont('Helvetica-Bold', 12)
-        canvas.setFillColor(colors.HexColor('#2c3e50'))
+        canvas.setFillColor(self._HEADER_COLOR)
         canvas.drawString(doc.leftMargin, doc.pagesize[1] - 0.5*inch, "Financial Transaction Report")
         
         # Footer
         canvas.setFont('Helvetica', 9)
-        canvas.setFillColor(colors.HexColor('#7f8c8d'))
+        canvas.setFillColor(self._FOOTER_COLOR)
         page_num = canvas.getPageNumber()
         canvas.drawString(doc.leftMargin, 0.5*inch, f"Page {page_num}")
         canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.5*inch, 
-                             f"Generated on {datetime.now().strftime('%d/%m/%Y')}")
+                             f"Generated on {self._footer_date}")
         
         canvas.restoreState()
     
     def generate_journal_pdf_buffer(self, journal_entries: List[Dict[str, Any]]) -> bytes:
         """Generate PDF and return as bytes buffer"""
-        import tempfile
-        import io
-        
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                self.generate_journal_pdf(journal_entries, tmp_file.name)
-                
-                # Read the file back into memory
-                with open(tmp_file.name, 'rb') as f:
-                    pdf_buffer = io.BytesIO(f.read())
-                
-                # Clean up
-                os.unlink(tmp_file.name)
-                
-                return pdf_buffer.getvalue()
-                
+            # SimpleDocTemplate writes to file-like objects, so no temporary file is needed
+            pdf_buffer = io.BytesIO()
+            self.generate_journal_pdf(journal_entries, pdf_buffer)
+            return pdf_buffer.getvalue()
+            
         except Exception as e:
             print(f"Error creating PDF buffer: {e}")
             raise
\ No newline at end of file
@@ -1,27 +1,42 @@
 import pandas as pd
-from typing import List, Dict, Any, Optional
+import numpy as np
+from typing import List, Dict, Any, Mapping, Optional
 from datetime import datetime
+from types import MappingProxyType
 import json
 
+# orjson writes UTF-8 bytes directly and handles NumPy scalars; fall back to json
+try:
+    import orjson
+    
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Read-only so every generator can share the same templates
+REPORT_TEMPLATES = MappingProxyType({
+    'executive_summary': MappingProxyType({
+        'sections': ('overview', 'key_metrics', 'trends', 'recommendations')
+    }),
+    'detailed_analysis': MappingProxyType({
+        'sections': ('transaction_analysis', 'category_breakdown', 'period_comparison', 'anomalies')
+    }),
+    'accounting_report': MappingProxyType({
+        'sections': ('journal_summary', 'ledger_analysis', 'trial_balance', 'compliance')
+    })
+})
+
 class ReportGenerator:
     """Generate comprehensive financial reports and analytics"""
     
     def __init__(self):
         self.report_templates = self._load_report_templates()
     
-    def _load_report_templates(self) -> Dict[str, Any]:
+    def _load_report_templates(self) -> Mapping[str, Any]:
         """Load report templates"""
-        return {
-            'executive_summary': {
-                'sections': ['overview', 'key_metrics', 'trends', 'recommendations']
-            },
-            'detailed_analysis': {
-                'sections': ['transaction_analysis', 'category_breakdown', 'period_comparison', 'anomalies']
-            },
-            'accounting_report': {
-                'sections': ['journal_summary', 'ledger_analysis', 'trial_balance', 'compliance']
-            }
-        }
+        return REPORT_TEMPLATES
     
     def generate_executive_summary(self, transactions_df: pd.DataFrame, 
                                  journal_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -32,11 +47,14 @@ class ReportGenerator:
             'sections': {}
         }
         
+        # Per-type totals shared by the overview and key metrics sections
+        type_totals = self._summarize_by_type(transactions_df)
+        
         # Overview section
-        report['sections']['overview'] = self._generate_overview_section(transactions_df, journal_entries)
+        report['sections']['overview'] = self._generate_overview_section(transactions_df, journal_entries, type_totals)
         
         # Key metrics section
-        report['sections']['key_metrics'] = self._generate_key_metrics_section(transactions_df)
+        report['sections']['key_metrics'] = self._generate_key_metrics_section(transactions_df, type_totals)
         
         # Trends section
         report['sections']['trends'] = self._generate_trends_section(transactions_df)
@@ -57,30 +75,71 @@ class ReportGenerator:
         if transactions_df.empty:
             return report
         
+        # Parse the date column once for every section that needs it
+        dates = self._parse_dates(transactions_df)
+        
         # Transaction analysis
-        report['sections']['transaction_analysis'] = self._generate_transaction_analysis(transactions_df)
+        report['sections']['transaction_analysis'] = self._generate_transaction_analysis(transactions_df, dates)
         
         # Category breakdown
         report['sections']['category_breakdown'] = self._generate_category_breakdown(transactions_df)
         
         # Period comparison (if date data available)
-        report['sections']['period_comparison'] = self._generate_period_comparison(transactions_df)
+        report['sections']['period_comparison'] = self._generate_period_comparison(transactions_df, dates)
         
         # Anomaly detection
         report['sections']['anomalies'] = self._detect_anomalies(transactions_df)
         
         return report
     
+    def _parse_dates(self, transactions_df: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        Parse the date column once, unparseable values becoming NaT
+        
+        Returns None when there is no date column or parsing fails, in which
+        case the sections parse (and report the failure) themselves.
+        """
+        if 'date' not in transactions_df.columns:
+            return None
+        try:
+            return pd.to_datetime(transactions_df['date'], errors='coerce', cache=True)
+        except Exception:
+            return None
+    
+    def _amount_values(self, transactions_df: pd.DataFrame) -> np.ndarray:
+        """Amount column as a NumPy array; reductions use the nan* functions to skip NaN like pandas"""
+        amounts = transactions_df['amount'].to_numpy(copy=False)
+        if amounts.dtype.kind not in 'iuf':
+            amounts = amounts.astype(np.float64)
+        return amounts
+    
+    def _summarize_by_type(self, transactions_df: pd.DataFrame) -> pd.DataFrame:
+        """Amount sum and row count per transaction type, from a single groupby"""
+        if transactions_df.empty:
+            return pd.DataFrame(columns=['sum', 'size'])
+        return transactions_df.groupby('type', sort=False, observed=True)['amount'].agg(['sum', 'size'])
+    
+    def _type_total(self, type_totals: pd.DataFrame, transaction_type: str, column: str):
+        """Read one per-type figure, 0 when the type does not occur"""
+        if column == 'size':
+            return int(type_totals.at[transaction_type, 'size']) if transaction_type in type_totals.index else 0
+        if transaction_type in type_totals.index:
+            return type_totals.at[transaction_type, 'sum']
+        return type_totals['sum'].dtype.type(0)
+    
     def _generate_overview_section(self, transactions_df: pd.DataFrame, 
-                                 journal_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                 journal_entries: List[Dict[str, Any]],
+                                 type_totals: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Generate overview section"""
         total_transactions = len(transactions_df)
         journal_count = len(journal_entries)
         
         if not transactions_df.empty:
-            total_amount = transactions_df['amount'].sum()
-            credit_total = transactions_df[transactions_df['type'] == 'CR']['amount'].sum()
-            debit_total = transactions_df[transactions_df['type'] == 'DR']['amount'].sum()
+            if type_totals is None:
+                type_totals = self._summarize_by_type(transactions_df)
+            total_amount = np.nansum(self._amount_values(transactions_df))
+            credit_total = self._type_total(type_totals, 'CR', 'sum')
+            debit_total = self._type_total(type_totals, 'DR', 'sum')
         else:
             total_amount = credit_total = debit_total = 0
         
@@ -94,22 +153,27 @@ class ReportGenerator:
             'processing_efficiency': f"{(journal_count / total_transactions * 100) if total_transactions > 0 else 0:.1f}%"
         }
     
-    def _generate_key_metrics_section(self, transactions_df: pd.DataFrame) -> Dict[str, Any]:
+    def _generate_key_metrics_section(self, transactions_df: pd.DataFrame,
+                                      type_totals: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Generate key metrics section"""
         if transactions_df.empty:
             return {}
         
+        if type_totals is None:
+            type_totals = self._summarize_by_type(transactions_df)
+        
         metrics = {}
         
         # Basic metrics
         metrics['transaction_count'] = len(transactions_df)
-        metrics['average_transaction_value'] = transactions_df['amount'].mean()
-        metrics['largest_transaction'] = transactions_df['amount'].max()
-        metrics['smallest_transaction'] = transactions_df['amount'].min()
+        amounts = self._amount_values(transactions_df)
+        metrics['average_transaction_value'] = np.nanmean(amounts)
+        metrics['largest_transaction'] = np.nanmax(amounts)
+        metrics['smallest_transaction'] = np.nanmin(amounts)
         
         # Type distribution
-        credit_count = len(transactions_df[transactions_df['type'] == 'CR'])
-        debit_count = len(transactions_df[transactions_df['type'] == 'DR'])
+        credit_count = self._type_total(type_totals, 'CR', 'size')
+        debit_count = self._type_total(type_totals, 'DR', 'size')
         metrics['credit_debit_ratio'] = f"{credit_count}:{debit_count}"
         
         # Category metrics (if available)
@@ -129,21 +193,25 @@ class ReportGenerator:
         try:
             trends = {}
             
-            # Convert dates for analysis
-            df_with_dates = transactions_df.copy()
-            df_with_dates['date'] = pd.to_datetime(df_with_dates['date'], errors='coerce')
+            # Convert dates for analysis (only the two columns used)
+            df_with_dates = pd.DataFrame({
+                'date': pd.to_datetime(transactions_df['date'], errors='coerce'),
+                'amount': transactions_df['amount']
+            })
             df_with_dates = df_with_dates.dropna(subset=['date'])
             
             if df_with_dates.empty:
                 return {'message': 'No valid dates for trend analysis'}
             
-            # Monthly trends
-            df_with_dates['month'] = df_with_dates['date'].dt.to_period('M')
-            monthly_totals = df_with_dates.groupby('month')['amount'].sum()
+            # Monthly trends, grouped on integer month numbers (wall-clock months for tz-aware dates)
+            dates = df_with_dates['date']
+            if dates.dt.tz is not None:
+                dates = dates.dt.tz_localize(None)
+            months = dates.to_numpy().astype('datetime64[M]')
+            monthly_totals = df_with_dates['amount'].groupby(months.astype(np.int64)).sum()
             
-            trends['monthly_totals'] = {
-                str(month): amount for month, amount in monthly_totals.items()
-            }
+            month_labels = np.datetime_as_string(monthly_totals.index.to_numpy().astype('datetime64[M]'), unit='M')
+            trends['monthly_totals'] = dict(zip(month_labels.tolist(), monthly_totals.tolist()))
             
             # Identify trends
             if len(monthly_totals) > 1:
@@ -163,8 +231,9 @@ class ReportGenerator:
             return ["No data available for recommendations"]
         
         # Check for high-value transactions
-        high_value_threshold = transactions_df['amount'].quantile(0.9)
-        high_value_count = len(transactions_df[transactions_df['amount'] > high_value_threshold])
+        amounts = self._amount_values(transactions_df)
+        high_value_threshold = np.nanquantile(amounts, 0.9)
+        high_value_count = int(np.count_nonzero(amounts > high_value_threshold))
         
         if high_value_count > 0:
             recommendations.append(
@@ -191,7 +260,8 @@ class ReportGenerator:
         
         return recommendations
     
-    def _generate_transaction_analysis(self, transactions_df: pd.DataFrame) -> Dict[str, Any]:
+    def _generate_transaction_analysis(self, transactions_df: pd.DataFrame, 
+                                       dates: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Generate detailed transaction analysis"""
         analysis = {}
         
@@ -199,12 +269,14 @@ class ReportGenerator:
             return analysis
         
         # Amount distribution
+        amounts = self._amount_values(transactions_df)
+        q1, median, q3 = np.nanquantile(amounts, [0.25, 0.5, 0.75])
         analysis['amount_statistics'] = {
-            'mean': transactions_df['amount'].mean(),
-            'median': transactions_df['amount'].median(),
-            'std_dev': transactions_df['amount'].std(),
-            'q1': transactions_df['amount'].quantile(0.25),
-            'q3': transactions_df['amount'].quantile(0.75)
+            'mean': np.nanmean(amounts),
+            'median': median,
+            'std_dev': np.nanstd(amounts, ddof=1) if np.count_nonzero(~np.isnan(amounts)) > 1 else np.float64(np.nan),
+            'q1': q1,
+            'q3': q3
         }
         
         # Transaction type analysis
@@ -214,15 +286,16 @@ class ReportGenerator:
         # Temporal analysis (if dates available)
         if 'date' in transactions_df.columns:
             try:
-                df_with_dates = transactions_df.copy()
-                df_with_dates['date'] = pd.to_datetime(df_with_dates['date'], errors='coerce')
-                df_with_dates = df_with_dates.dropna(subset=['date'])
+                if dates is None:
+                    dates = pd.to_datetime(transactions_df['date'], errors='coerce')
+                valid_dates = dates.dropna()
                 
-                if not df_with_dates.empty:
+                if not valid_dates.empty:
+                    start, end = valid_dates.min(), valid_dates.max()
                     analysis['date_range'] = {
-                        'start': df_with_dates['date'].min().strftime('%Y-%m-%d'),
-                        'end': df_with_dates['date'].max().strftime('%Y-%m-%d'),
-                        'days_covered': (df_with_dates['date'].max() - df_with_dates['date'].min()).days
+                        'start': start.strftime('%Y-%m-%d'),
+                        'end': end.strftime('%Y-%m-%d'),
+                        'days_covered': (end - start).days
                     }
             except:
                 pass
@@ -251,7 +324,8 @@ class ReportGenerator:
         
         return breakdown
     
-    def _generate_period_comparison(self, transactions_df: pd.DataFrame) -> Dict[str, Any]:
+    def _generate_period_comparison(self, transactions_df: pd.DataFrame, 
+                                    dates: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Generate period comparison analysis"""
         comparison = {}
         
@@ -259,19 +333,23 @@ class ReportGenerator:
             return comparison
         
         try:
-            df_with_dates = transactions_df.copy()
-            df_with_dates['date'] = pd.to_datetime(df_with_dates['date'], errors='coerce')
+            df_with_dates = pd.DataFrame({
+                'date': dates if dates is not None else pd.to_datetime(transactions_df['date'], errors='coerce'),
+                'amount': transactions_df['amount']
+            })
             df_with_dates = df_with_dates.dropna(subset=['date'])
             
             if df_with_dates.empty:
                 return comparison
             
-            # Compare first and second half of period
-            sorted_dates = df_with_dates['date'].sort_values()
-            mid_point = len(sorted_dates) // 2
+            # Compare first and second half of period, split at the middle date
+            # (selected with a partition rather than a full sort)
+            mid_point = len(df_with_dates) // 2
+            mid_position = np.argpartition(df_with_dates['date'].values, mid_point)[mid_point]
+            mid_date = df_with_dates['date'].iloc[mid_position]
             
-            first_half = df_with_dates[df_with_dates['date'] <= sorted_dates.iloc[mid_point]]
-            second_half = df_with_dates[df_with_dates['date'] > sorted_dates.iloc[mid_point]]
+            first_half = df_with_dates[df_with_dates['date'] <= mid_date]
+            second_half = df_with_dates[df_with_dates['date'] > mid_date]
             
             if not first_half.empty and not second_half.empty:
                 comparison['period_comparison'] = {
@@ -304,16 +382,14 @@ class ReportGenerator:
             return anomalies
         
         # Detect outliers using IQR method
-        Q1 = transactions_df['amount'].quantile(0.25)
-        Q3 = transactions_df['amount'].quantile(0.75)
+        amounts = self._amount_values(transactions_df)
+        Q1, Q3 = np.nanquantile(amounts, [0.25, 0.75])
         IQR = Q3 - Q1
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
         
-        outliers = transactions_df[
-            (transactions_df['amount'] < lower_bound) | 
-            (transactions_df['amount'] > upper_bound)
-        ]
+        outlier_mask = (amounts < lower_bound) | (amounts > upper_bound)
+        outliers = transactions_df.iloc[np.flatnonzero(outlier_mask)]
         
         if not outliers.empty:
             anomalies['statistical_outliers'] = {
@@ -337,40 +413,97 @@ class ReportGenerator:
         if transactions_df.empty:
             return duplicates
         
-        # Group by amount and description similarity
-        grouped = transactions_df.groupby('amount')
-        
-        for amount, group in grouped:
-            if len(group) > 1:
-                # Check for similar descriptions
-                for i, row1 in group.iterrows():
-                    for j, row2 in group.iterrows():
-                        if i >= j:
-                            continue
-                        
-                        # Simple similarity check (could be enhanced with fuzzy matching)
-                        desc1 = str(row1['description']).lower()
-                        desc2 = str(row2['description']).lower()
-                        
-                        # Check if descriptions are similar
-                        words1 = set(desc1.split())
-                        words2 = set(desc2.split())
-                        similarity = len(words1.intersection(words2)) / max(len(words1), len(words2))
-                        
-                        if similarity > 0.6:  # 60% similarity threshold
-                            duplicates.append({
-                                'transaction1': row1.to_dict(),
-                                'transaction2': row2.to_dict(),
-                                'similarity_score': similarity
-                            })
+        # Group by amount; group numbers follow the sorted amounts (-1 for missing amounts)
+        group_ids = transactions_df.groupby('amount').ngroup().to_numpy()
+        order = np.argsort(group_ids, kind='stable')
+        group_starts = np.flatnonzero(np.diff(group_ids[order], prepend=-2))
+        groups = [positions for positions in np.split(order, group_starts[1:])
+                  if len(positions) > 1 and group_ids[positions[0]] >= 0]
+        if not groups:
+            return duplicates
+        
+        # scikit-learn is only needed here, so it is imported on first use
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        # Tokenise every description once into a binary row-per-transaction word matrix
+        descriptions = [str(description).lower() for description in transactions_df['description'].tolist()]
+        vectorizer = CountVectorizer(tokenizer=str.split, lowercase=False, token_pattern=None, binary=True)
+        try:
+            word_matrix = vectorizer.fit_transform(descriptions).tocsr()
+        except ValueError:
+            # No description has any words
+            return duplicates
+        word_counts = np.asarray(word_matrix.sum(axis=1)).ravel()
+        prefix_matrix = self._rare_word_prefixes(word_matrix, word_counts, 0.6)
+        labels = transactions_df.index.to_numpy()
+        row_dicts = {}
+        
+        for positions in groups:
+            group_words = word_matrix[positions]
+            group_counts = word_counts[positions]
+            group_labels = labels[positions]
+            group_prefixes = prefix_matrix[positions]
+            
+            # Candidate pairs share a rare word; each pair once, ordered by index label
+            candidates = (group_prefixes @ group_prefixes.T).tocoo()
+            rows, cols = candidates.row, candidates.col
+            keep = group_labels[rows] < group_labels[cols]
+            rows, cols = rows[keep], cols[keep]
+            if not len(rows):
+                continue
+            pair_order = np.lexsort((cols, rows))
+            rows, cols = rows[pair_order], cols[pair_order]
+            
+            # Exact shared-word counts for the candidates only; 60% similarity threshold
+            shared = np.asarray(group_words[rows].multiply(group_words[cols]).sum(axis=1)).ravel()
+            largest = np.maximum(group_counts[rows], group_counts[cols])
+            similarity = shared / np.maximum(largest, 1)
+            
+            for row, col, score in zip(rows[similarity > 0.6], cols[similarity > 0.6], similarity[similarity > 0.6]):
+                first, second = positions[row], positions[col]
+                for position in (first, second):
+                    if position not in row_dicts:
+                        row_dicts[position] = transactions_df.iloc[position].to_dict()
+                duplicates.append({
+                    'transaction1': dict(row_dicts[first]),
+                    'transaction2': dict(row_dicts[second]),
+                    'similarity_score': float(score)
+                })
         
         return duplicates
     
+    def _rare_word_prefixes(self, word_matrix, word_counts: np.ndarray, threshold: float):
+        """
+        Keep each description's rarest words needed to reach the similarity threshold
+        
+        Two descriptions sharing more than threshold of their words must share
+        at least one word among these prefixes (prefix filtering), so only rows
+        with a common prefix word need their overlap counted.
+        """
+        from scipy import sparse
+        
+        # Fewest shared words for shared / count > threshold, and the prefix that guarantees it
+        min_overlap = np.floor(threshold * word_counts).astype(np.int64) + 1
+        min_overlap = np.where((min_overlap - 1) / np.maximum(word_counts, 1) > threshold, min_overlap - 1, min_overlap)
+        prefix_lengths = np.clip(word_counts - min_overlap + 1, 0, None)
+        
+        # Renumber words from rarest to most common so each row's prefix is its leading entries
+        document_frequency = np.asarray(word_matrix.sum(axis=0)).ravel()
+        by_rarity = np.argsort(document_frequency, kind='stable')
+        ranked = word_matrix[:, by_rarity].tocsr()
+        ranked.sort_indices()
+        
+        row_lengths = np.diff(ranked.indptr)
+        offsets = np.arange(ranked.nnz) - np.repeat(ranked.indptr[:-1], row_lengths)
+        in_prefix = offsets < np.repeat(prefix_lengths, row_lengths)
+        indptr = np.concatenate(([0], np.cumsum(np.minimum(prefix_lengths, row_lengths))))
+        return sparse.csr_matrix((ranked.data[in_prefix], ranked.indices[in_prefix], indptr), shape=ranked.shape)
+    
     def export_report_to_json(self, report: Dict[str, Any], output_path: str) -> str:
         """Export report to JSON file"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            with open(output_path, 'wb') as f:
+                f.write(_json_dumps(report))
             
             print(f"Report exported to JSON: {output_path}")
             return output_path
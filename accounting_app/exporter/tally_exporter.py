@@ -1,10 +1,26 @@
+import os
+import uuid
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any
+from io import StringIO
+from typing import List, Dict, Any, Callable, Optional
 from datetime import datetime
 
 class TallyExporter:
     """Export data to Tally accounting software format"""
     
+    XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+    
+    # Fixed envelope around the company and vouchers, in ElementTree's serialization
+    _ENVELOPE_OPEN = (
+        '<ENVELOPE><HEADER><TALLYREQUEST>Import Data</TALLYREQUEST></HEADER>'
+        '<BODY><IMPORTDATA><REQUESTDESC><REPORTNAME>Vouchers</REPORTNAME></REQUESTDESC>'
+        '<REQUESTDATA><TALLYMESSAGE xmlns:UDF="TallyUDF">'
+    )
+    _ENVELOPE_CLOSE = '</TALLYMESSAGE></REQUESTDATA></IMPORTDATA></BODY></ENVELOPE>'
+    
+    # Deletes currency symbols and thousands separators in a single pass
+    _AMOUNT_STRIP = str.maketrans('', '', '₹,')
+    
     def __init__(self):
         self.tally_version = "1.0"
         self.company_name = "Default Company"
@@ -21,44 +37,39 @@ class TallyExporter:
         Returns:
             Tally XML as string
         """
+        buffer = StringIO()
+        self._write_tally_xml(buffer.write, journal_entries, company_name)
+        return buffer.getvalue()
+    
+    def _write_tally_xml(self, write: Callable[[str], Any], journal_entries: List[Dict[str, Any]],
+                         company_name: str = None):
+        """
+        Stream Tally XML through write, one voucher at a time
+        
+        Only a single voucher element is held in memory; it is serialized
+        and dropped before the next entry is processed.
+        """
         if company_name:
             self.company_name = company_name
         
-        # Create XML structure
-        root = ET.Element("ENVELOPE")
-        
-        # Header
-        header = ET.SubElement(root, "HEADER")
-        ET.SubElement(header, "TALLYREQUEST").text = "Import Data"
-        
-        # Body
-        body = ET.SubElement(root, "BODY")
-        data = ET.SubElement(body, "IMPORTDATA")
-        request_desc = ET.SubElement(data, "REQUESTDESC")
-        ET.SubElement(request_desc, "REPORTNAME").text = "Vouchers"
-        
-        # Company details
-        company_data = ET.SubElement(data, "REQUESTDATA")
-        tally_message = ET.SubElement(company_data, "TALLYMESSAGE", {"xmlns:UDF": "TallyUDF"})
+        write(self.XML_DECLARATION + '\n')
+        write(self._ENVELOPE_OPEN)
         
         # Company creation
-        company = ET.SubElement(tally_message, "COMPANY")
+        company = ET.Element("COMPANY")
         ET.SubElement(company, "NAME").text = self.company_name
+        write(ET.tostring(company, encoding='unicode', method='xml'))
         
         # Add voucher entries
         for entry in journal_entries:
-            voucher = self._create_voucher_element(tally_message, entry)
-        
-        # Convert to string
-        xml_str = ET.tostring(root, encoding='unicode', method='xml')
+            voucher = self._create_voucher_element(None, entry)
+            write(ET.tostring(voucher, encoding='unicode', method='xml'))
         
-        # Add XML declaration
-        xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>'
-        return xml_declaration + '\n' + xml_str
+        write(self._ENVELOPE_CLOSE)
     
-    def _create_voucher_element(self, parent, entry: Dict[str, Any]) -> ET.Element:
-        """Create Tally voucher element from journal entry"""
-        voucher = ET.SubElement(parent, "VOUCHER")
+    def _create_voucher_element(self, parent: Optional[ET.Element], entry: Dict[str, Any]) -> ET.Element:
+        """Create Tally voucher element from journal entry (standalone when parent is None)"""
+        voucher = ET.Element("VOUCHER") if parent is None else ET.SubElement(parent, "VOUCHER")
         
         # Voucher details
         ET.SubElement(voucher, "DATE").text = self._format_date_for_tally(entry.get('date'))
@@ -105,8 +116,7 @@ class TallyExporter:
                 return str(amount_str)
             
             # Remove currency symbols and commas
-            clean_amount = str(amount_str).replace('₹', '').replace(',', '').strip()
-            return clean_amount
+            return str(amount_str).translate(self._AMOUNT_STRIP).strip()
         except:
             return "0"
     
@@ -123,11 +133,18 @@ class TallyExporter:
         Returns:
             Path to created file
         """
+        # Stream into a temporary file next to the target and move it into place
+        # once complete, so a failure never leaves a truncated XML file behind
+        temp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
         try:
-            tally_xml = self.generate_tally_xml(journal_entries, company_name)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(tally_xml)
+            try:
+                with open(temp_path, 'x', encoding='utf-8') as f:
+                    self._write_tally_xml(f.write, journal_entries, company_name)
+                os.replace(temp_path, output_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
             
             print(f"Tally XML exported: {output_path}")
             return output_path
@@ -158,8 +175,8 @@ class TallyExporter:
             # Check amount consistency
             if 'debit_amount' in entry and 'credit_amount' in entry:
                 try:
-                    debit = float(str(entry['debit_amount']).replace('₹', '').replace(',', ''))
-                    credit = float(str(entry['credit_amount']).replace('₹', '').replace(',', ''))
+                    debit = float(str(entry['debit_amount']).translate(self._AMOUNT_STRIP))
+                    credit = float(str(entry['credit_amount']).translate(self._AMOUNT_STRIP))
                     
                     if abs(debit - credit) > 0.01:  # Allow for rounding differences
                         entry_errors.append("Debit and credit amounts don't match")